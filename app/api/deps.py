@@ -8,7 +8,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.db.database import get_db
-from app.db.models.user import User
+from app.repositories.user_repository import UserRepository
 from app.schemas.user import UserResponse
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/token")
@@ -26,11 +26,11 @@ async def get_current_user(
             raise HTTPException(status_code=401, detail="Invalid token")
 
         # get db
-        user = db.query(User).filter(User.id == user_id).first()
+        user = await UserRepository.get_by_id(user_id, db)
         if not user:
             raise HTTPException(status_code=401, detail="User not found")
 
-        return UserResponse.model_validate(user)
+        return user
     except JWTError:
         raise HTTPException(status_code=401, detail="Invalid token")
 
@@ -239,13 +239,34 @@ async def create_document(
     logger.info(f"Uploading document {file.filename} to knowledge base {kb_id}")
     payload = DocumentUpload(
         title=file.filename,
-        content=file.file.read(),
+        content=await file.read(),
         knowledge_base_id=kb_id,
         content_type=file.content_type,
     )
     return await doc_service.create_document(kb_id, payload, current_user)
 
 
+@router.post("/{kb_id}/documents/bulk", response_model=List[DocumentResponse])
+async def create_documents(
+    kb_id: str = Path(..., description="Knowledge base ID"),
+    files: List[UploadFile] = File(..., description="Documents to upload"),
+    current_user: UserResponse = Depends(get_current_user),
+    doc_service: DocumentService = Depends(get_document_service),
+):
+    """Upload several documents to a knowledge base in one request"""
+    logger.info(f"Uploading {len(files)} documents to knowledge base {kb_id}")
+    payloads = [
+        DocumentUpload(
+            title=file.filename,
+            content=await file.read(),
+            knowledge_base_id=kb_id,
+            content_type=file.content_type,
+        )
+        for file in files
+    ]
+    return await doc_service.create_documents(kb_id, payloads, current_user)
+
+
 @router.get("/{kb_id}/documents", response_model=List[DocumentResponse])
 async def list_documents(
     kb_id: str = Path(..., description="Knowledge base ID"),
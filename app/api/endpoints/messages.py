@@ -1,13 +1,14 @@
 from functools import lru_cache
 from typing import List
 
-from fastapi import APIRouter, Body, Depends, Path
+from fastapi import APIRouter, Body, Depends, Path, Response
 from sqlalchemy.orm import Session
 
 from app.api.deps import get_current_user
 from app.api.endpoints.conversations import get_conversation_service
 from app.db.database import get_db
 from app.repositories.message_repository import MessageRepository
+from app.schemas._adapters import list_adapter_for
 from app.schemas.message import MessageCreate, MessageResponse
 from app.schemas.user import UserResponse
 from app.services.message_service import MessageService
@@ -58,7 +59,13 @@ async def list_messages(
     message_service: MessageService = Depends(get_message_service),
 ):
     """List all messages in a conversation"""
-    return await message_service.list_messages(conversation_id, current_user)
+    messages = await message_service.list_messages(conversation_id, current_user)
+    # Serialize in pydantic-core and return the bytes so FastAPI does not dump,
+    # re-validate and re-encode every message and its sources
+    return Response(
+        content=list_adapter_for(MessageResponse).dump_json(messages),
+        media_type="application/json",
+    )
 
 
 @router.get("/{conversation_id}/messages/{message_id}", response_model=MessageResponse)
@@ -69,4 +76,7 @@ async def get_message(
     message_service: MessageService = Depends(get_message_service),
 ):
     """Get a message by ID"""
-    return await message_service.get_message(conversation_id, message_id, current_user)
+    message = await message_service.get_message(
+        conversation_id, message_id, current_user
+    )
+    return Response(content=message.model_dump_json(), media_type="application/json")
@@ -49,8 +49,13 @@ async def get_current_user_info(
     # Get permissions for the user's role
     permissions = [perm.value for perm in get_permissions_for_role(user.role)]
 
-    # Create a UserWithPermissions response
-    return {**user.dict(), "permissions": permissions}
+    # Create a UserWithPermissions response; model_dump leaves out the
+    # excluded password hash, so pass it through explicitly
+    return UserWithPermissions(
+        **user.model_dump(),
+        hashed_password=user.hashed_password,
+        permissions=permissions,
+    )
 
 
 @router.get("/{user_id}", response_model=UserResponse)
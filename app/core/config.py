@@ -36,6 +36,11 @@ class Settings(BaseSettings):
     PINECONE_API_KEY: str = os.getenv("PINECONE_API_KEY", "")
     PINECONE_ENVIRONMENT: str = os.getenv("PINECONE_ENVIRONMENT", "")
     PINECONE_INDEX_NAME: str = os.getenv("PINECONE_INDEX_NAME", "docbrain")
+    # Data-plane host of PINECONE_INDEX_NAME; when set, connecting to the index
+    # skips the describe_index lookup
+    PINECONE_INDEX_HOST: str = os.getenv("PINECONE_INDEX_HOST", "")
+    # Talk to the index over gRPC (needs the pinecone[grpc] extra)
+    PINECONE_USE_GRPC: bool = False
     PINECONE_SUMMARY_INDEX_NAME: str = os.getenv(
         "PINECONE_SUMMARY_INDEX_NAME", "summary"
     )
@@ -12,6 +12,23 @@ from app.core.permissions import Permission, get_permissions_for_role
 logger = logging.getLogger(__name__)
 
 
+class UnhandledErrorMiddleware(BaseHTTPMiddleware):
+    """
+    Middleware to turn unexpected errors into a 500 without exposing their details.
+    It must be added before CORSMiddleware so the 500 still carries CORS headers.
+    """
+
+    async def dispatch(self, request: Request, call_next: Callable):
+        try:
+            return await call_next(request)
+        except Exception:
+            logger.exception(f"Unhandled error on {request.method} {request.url.path}")
+            return JSONResponse(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                content={"detail": "Internal server error"},
+            )
+
+
 class PermissionsMiddleware(BaseHTTPMiddleware):
     """
     Middleware to check permissions for endpoints
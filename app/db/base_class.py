@@ -1,13 +1,18 @@
 import uuid
+from datetime import datetime, timezone
 
 from sqlalchemy import Column, DateTime, String
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.sql import func
 
 # Create base class for SQLAlchemy models
 Base = declarative_base()
 
 
+def utcnow() -> datetime:
+    """Naive UTC timestamp from the app clock, for insert and update defaults"""
+    return datetime.now(timezone.utc).replace(tzinfo=None)
+
+
 # Define a base model class with common fields
 class BaseModel(Base):
     """Base model class with common fields for all SQLAlchemy models"""
@@ -15,5 +20,5 @@ class BaseModel(Base):
     __abstract__ = True
 
     id = Column(String(255), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, onupdate=utcnow)
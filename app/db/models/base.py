@@ -2,7 +2,7 @@ import uuid
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class DBModel(BaseModel):
@@ -18,5 +18,4 @@ class DBModel(BaseModel):
         """Update the updated_at timestamp"""
         self.updated_at = datetime.utcnow().isoformat()
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,6 @@
 from sqlalchemy import Boolean, Column, DateTime, ForeignKey, String
-from sqlalchemy.sql import func
 
-from app.db.base_class import BaseModel
+from app.db.base_class import BaseModel, utcnow
 
 
 class Conversation(BaseModel):
@@ -13,5 +12,5 @@ class Conversation(BaseModel):
     user_id = Column(String(255), ForeignKey("users.id"))
     knowledge_base_id = Column(String(255), ForeignKey("knowledge_bases.id"))
     is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
@@ -11,9 +11,8 @@ from sqlalchemy import (
     Text,
 )
 from sqlalchemy.orm import relationship
-from sqlalchemy.sql import func
 
-from app.db.base_class import BaseModel
+from app.db.base_class import BaseModel, utcnow
 
 
 class DocumentStatus(str, enum.Enum):
@@ -50,7 +49,7 @@ class Document(BaseModel):
 
     title = Column(String(500), nullable=False)
     knowledge_base_id = Column(String(255), ForeignKey("knowledge_bases.id"), nullable=False)
-    content = Column(LargeBinary, nullable=False)  # Base64 encoded content
+    content = Column(LargeBinary, nullable=False)  # Raw file bytes
     content_type = Column(String(100), nullable=False)
     size_bytes = Column(Integer, nullable=False)
     user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
@@ -58,8 +57,8 @@ class Document(BaseModel):
     error_message = Column(Text, nullable=True)
     processed_chunks = Column(Integer, nullable=True)
     summary = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     class Config:
         json_schema_extra = {
@@ -92,7 +91,7 @@ knowledge_base_sharing = Table(
         ForeignKey("users.id", ondelete="CASCADE"),
         primary_key=True,
     ),
-    Column("created_at", DateTime, default=func.now()),
+    Column("created_at", DateTime, default=utcnow),
 )
 
 
@@ -104,8 +103,8 @@ class KnowledgeBase(BaseModel):
     name = Column(String(500), nullable=False)
     description = Column(Text, nullable=True)
     user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     # Define relationship to users that this knowledge base is shared with
     shared_with = relationship(
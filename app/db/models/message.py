@@ -1,9 +1,8 @@
 import enum
 
 from sqlalchemy import JSON, Column, DateTime, ForeignKey, String, Text
-from sqlalchemy.sql import func
 
-from app.db.base_class import BaseModel
+from app.db.base_class import BaseModel, utcnow
 
 
 class MessageKind(str, enum.Enum):
@@ -33,17 +32,21 @@ class Message(BaseModel):
     __tablename__ = "messages"
 
     content = Column(Text, nullable=False)
-    content_type = Column(String(100), nullable=False, default=MessageContentType.TEXT.value)
+    content_type = Column(
+        String(100), nullable=False, default=MessageContentType.TEXT.value
+    )
     kind = Column(String(50), nullable=False, default=MessageKind.USER.value)
-    conversation_id = Column(String(255), ForeignKey("conversations.id"), nullable=False)
+    conversation_id = Column(
+        String(255), ForeignKey("conversations.id"), nullable=False
+    )
     user_id = Column(String(255), ForeignKey("users.id"), nullable=False)
     sources = Column(JSON, nullable=True)
     message_metadata = Column(
         JSON, nullable=True
     )  # For storing query routing info and other metadata
     status = Column(String(50), nullable=False)
-    created_at = Column(DateTime, default=func.now())
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())
+    created_at = Column(DateTime, default=utcnow)
+    updated_at = Column(DateTime, default=utcnow, onupdate=utcnow)
 
     # Optional fields for tracking sources
     knowledge_base_id = Column(String(255), ForeignKey("knowledge_bases.id"))
@@ -1,6 +1,6 @@
 from enum import Enum
 
-from pydantic import Field
+from pydantic import ConfigDict, Field
 from sqlalchemy import Column, ForeignKey, String, Text
 
 from app.db.base_class import BaseModel
@@ -44,5 +44,4 @@ class QuestionModel(DBModel):
     knowledge_base_id: str
     user_id: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -7,6 +7,7 @@ from app.core.middleware import (
     DEFAULT_PATH_PERMISSIONS,
     PermissionsMiddleware,
     RateLimitMiddleware,
+    UnhandledErrorMiddleware,
 )
 
 app = FastAPI(
@@ -14,6 +15,9 @@ app = FastAPI(
     version="1.0.0",
 )
 
+# Add unhandled error middleware inside CORS, so a 500 keeps its CORS headers
+app.add_middleware(UnhandledErrorMiddleware)
+
 # Add CORS middleware
 app.add_middleware(
     CORSMiddleware,
@@ -1,10 +1,13 @@
 import logging
 from typing import List, Optional
 
+from sqlalchemy import delete, select, update
 from sqlalchemy.orm import Session
 
 from app.db.models.conversation import Conversation
+from app.db.models.message import Message
 from app.db.models.user import User
+from app.schemas._adapters import list_adapter_for
 from app.schemas.conversation import (
     ConversationResponse,
     ConversationUpdate,
@@ -33,11 +36,7 @@ class ConversationRepository:
     ) -> Optional[ConversationResponse]:
         """Get conversation by ID for a specific user"""
         try:
-            conversation = (
-                db.query(Conversation)
-                .filter(Conversation.id == conversation_id)
-                .first()
-            )
+            conversation = db.get(Conversation, conversation_id)
             if conversation and conversation.user_id == str(user.id):
                 return ConversationResponse.model_validate(conversation)
             return None
@@ -53,10 +52,7 @@ class ConversationRepository:
             db.query(Conversation).filter(Conversation.user_id == user.id).all()
         )
         logger.info(f"Found {len(conversations)} conversations for user {user.id}")
-        return [
-            ConversationResponse.model_validate(conversation)
-            for conversation in conversations
-        ]
+        return list_adapter_for(ConversationResponse).validate_python(conversations)
 
     @staticmethod
     async def update(
@@ -65,65 +61,79 @@ class ConversationRepository:
         user: User,
         db: Session,
     ) -> Optional[ConversationResponse]:
-        """Update conversation details"""
-        try:
-            # First verify ownership
-            conversation = (
-                db.query(Conversation)
-                .filter(Conversation.id == conversation_id)
-                .first()
-            )
-            if not conversation:
-                return None
+        """
+        Update a conversation owned by the user.
 
-            # Update the conversation
+        Ownership is part of the UPDATE's WHERE clause, so no separate
+        lookup is needed before writing.
+
+        Returns:
+            Updated conversation, or None if it does not exist or belongs to
+            another user
+        """
+        try:
             update_data = conversation_update.model_dump(exclude_unset=True)
             if update_data:
-                db.query(Conversation).update(update_data)
+                result = db.execute(
+                    update(Conversation)
+                    .where(
+                        Conversation.id == conversation_id,
+                        Conversation.user_id == user.id,
+                    )
+                    .values(**update_data)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    db.rollback()
+                    return None
                 db.commit()
-                db.refresh(conversation)
-                return await ConversationRepository.get_by_id(conversation_id, user, db)
+
+            # No RETURNING on MySQL, so read the row back by primary key
+            return await ConversationRepository.get_by_id(conversation_id, user, db)
         except Exception as e:
+            db.rollback()
             logger.error(f"Failed to update conversation: {e}")
             raise
 
     @staticmethod
     async def delete(conversation_id: str, user: User, db: Session) -> bool:
-        """Delete a conversation and all its messages"""
-        try:
-            # First verify ownership
-            conversation = (
-                db.query(Conversation)
-                .filter(Conversation.id == conversation_id)
-                .first()
-            )
-            if not conversation:
-                return False
+        """
+        Delete a conversation owned by the user, and all its messages.
 
-            # Start transaction
-            db.execute("BEGIN TRANSACTION")
-            try:
-                # Delete all messages first
-                logger.debug(f"Deleting messages for conversation {conversation_id}")
-                db.execute(
-                    "DELETE FROM messages WHERE conversation_id = ?", [conversation_id]
-                )
-
-                # Then delete the conversation
-                logger.debug(f"Deleting conversation {conversation_id}")
-                db.execute("DELETE FROM conversations WHERE id = ?", [conversation_id])
+        Both DELETEs filter on the owner, so no separate lookup is needed.
 
-                # Commit transaction
-                db.execute("COMMIT")
-                logger.info(
-                    f"Successfully deleted conversation {conversation_id} and its messages"
+        Returns:
+            True if the conversation was deleted, False if it does not exist
+            or belongs to another user
+        """
+        try:
+            owned = select(Conversation.id).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == user.id,
+            )
+            # Messages reference the conversation, so they go first
+            db.execute(
+                delete(Message)
+                .where(Message.conversation_id.in_(owned))
+                .execution_options(synchronize_session=False)
+            )
+            result = db.execute(
+                delete(Conversation)
+                .where(
+                    Conversation.id == conversation_id,
+                    Conversation.user_id == user.id,
                 )
-                return True
-            except Exception as e:
-                # Rollback on error
-                db.execute("ROLLBACK")
-                logger.error(f"Failed to delete conversation {conversation_id}: {e}")
-                raise
+                .execution_options(synchronize_session=False)
+            )
+            if result.rowcount == 0:
+                db.rollback()
+                return False
+            db.commit()
+            logger.info(
+                f"Successfully deleted conversation {conversation_id} and its messages"
+            )
+            return True
         except Exception as e:
-            logger.error(f"Error in delete operation: {e}")
+            db.rollback()
+            logger.error(f"Failed to delete conversation {conversation_id}: {e}")
             raise
@@ -1,13 +1,23 @@
 import logging
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
 
-from sqlalchemy.orm import Session
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session, lazyload
 
-from app.db.models.knowledge_base import Document, DocumentStatus
+from app.db.models.knowledge_base import Document, DocumentStatus, KnowledgeBase
+from app.schemas._adapters import list_adapter_for
 from app.schemas.document import DocumentResponse
+from app.schemas.knowledge_base import KnowledgeBaseResponse
 
 logger = logging.getLogger(__name__)
 
+# Every document column except the file content, which listings never return
+_LISTING_COLUMNS = tuple(
+    column for column in Document.__table__.columns if column.key != "content"
+)
+
+_UPDATABLE_COLUMNS = frozenset(Document.__table__.columns.keys()) - {"id", "created_at"}
+
 
 class DocumentRepository:
     """Repository for document operations"""
@@ -34,6 +44,34 @@ class DocumentRepository:
             logger.error(f"Failed to create document: {e}")
             raise
 
+    @staticmethod
+    async def create_many(
+        documents: List[Document], db: Session
+    ) -> List[DocumentResponse]:
+        """
+        Create several documents in one transaction.
+
+        Args:
+            documents: Document instances
+            db: Database session
+
+        Returns:
+            Created documents, in the given order
+        """
+        try:
+            # Flush the INSERTs so defaults are populated, then build the
+            # responses before commit expires the instances
+            db.add_all(documents)
+            db.flush()
+            responses = list_adapter_for(DocumentResponse).validate_python(documents)
+
+            db.commit()
+            return responses
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to create {len(documents)} documents: {e}")
+            raise
+
     @staticmethod
     async def get_by_id(document_id: str, db: Session) -> Optional[DocumentResponse]:
         """
@@ -47,7 +85,7 @@ class DocumentRepository:
             Document if found, None otherwise
         """
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
+            document = db.get(Document, document_id)
             if not document:
                 return None
             return DocumentResponse.model_validate(document)
@@ -55,6 +93,39 @@ class DocumentRepository:
             logger.error(f"Failed to get document by ID {document_id}: {e}")
             raise
 
+    @staticmethod
+    async def get_with_knowledge_base(
+        document_id: str, db: Session
+    ) -> Optional[Tuple[DocumentResponse, KnowledgeBaseResponse]]:
+        """
+        Get a document, without its content, and its knowledge base in one query.
+
+        Args:
+            document_id: Document ID
+            db: Database session
+
+        Returns:
+            Document and knowledge base if found, None otherwise
+        """
+        try:
+            row = db.execute(
+                select(*_LISTING_COLUMNS, KnowledgeBase)
+                .join(KnowledgeBase, KnowledgeBase.id == Document.knowledge_base_id)
+                .where(Document.id == document_id)
+                .options(lazyload(KnowledgeBase.shared_with))
+            ).one_or_none()
+            if not row:
+                return None
+            return (
+                DocumentResponse.model_validate(row),
+                KnowledgeBaseResponse.model_validate(row.KnowledgeBase),
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to get document {document_id} with its knowledge base: {e}"
+            )
+            raise
+
     @staticmethod
     async def list_all(
         db: Session, skip: int = 0, limit: int = 100
@@ -72,7 +143,7 @@ class DocumentRepository:
         """
         try:
             documents = db.query(Document).offset(skip).limit(limit).all()
-            return [DocumentResponse.model_validate(doc) for doc in documents]
+            return list_adapter_for(DocumentResponse).validate_python(documents)
         except Exception as e:
             logger.error(f"Failed to list documents: {e}")
             raise
@@ -96,26 +167,49 @@ class DocumentRepository:
             status: Optional status filter
 
         Returns:
-            List of documents
+            List of documents, without their content
         """
         try:
-            query = db.query(Document).filter(
+            query = select(*_LISTING_COLUMNS).where(
                 Document.knowledge_base_id == knowledge_base_id
             )
 
             if status:
-                query = query.filter(Document.status == status)
+                query = query.where(Document.status == status)
 
-            return [
-                DocumentResponse.model_validate(doc)
-                for doc in query.offset(skip).limit(limit).all()
-            ]
+            return list_adapter_for(DocumentResponse).validate_python(
+                db.execute(query.offset(skip).limit(limit)).all()
+            )
         except Exception as e:
             logger.error(
                 f"Failed to list documents for knowledge base {knowledge_base_id}: {e}"
             )
             raise
 
+    @staticmethod
+    async def count_by_knowledge_base(knowledge_base_id: str, db: Session) -> int:
+        """
+        Count the documents in a knowledge base.
+
+        Args:
+            knowledge_base_id: Knowledge base ID
+            db: Database session
+
+        Returns:
+            Number of documents
+        """
+        try:
+            return db.scalar(
+                select(func.count())
+                .select_from(Document)
+                .where(Document.knowledge_base_id == knowledge_base_id)
+            )
+        except Exception as e:
+            logger.error(
+                f"Failed to count documents for knowledge base {knowledge_base_id}: {e}"
+            )
+            raise
+
     @staticmethod
     async def set_processing(
         document_id: str, db: Session
@@ -124,7 +218,7 @@ class DocumentRepository:
         Set a document as processing.
         """
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
+            document = db.get(Document, document_id)
             if not document:
                 return None
             document.status = DocumentStatus.PROCESSING
@@ -144,7 +238,7 @@ class DocumentRepository:
         Set a document as processed.
         """
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
+            document = db.get(Document, document_id)
             if not document:
                 return None
             document.status = DocumentStatus.PROCESSED
@@ -166,7 +260,7 @@ class DocumentRepository:
         Set a document as failed.
         """
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
+            document = db.get(Document, document_id)
             if not document:
                 return None
             document.status = DocumentStatus.FAILED
@@ -195,18 +289,33 @@ class DocumentRepository:
             Updated document if found, None otherwise
         """
         try:
-            # Get document
-            document = db.query(Document).filter(Document.id == document_id).first()
-            if not document:
-                return None
+            # Only real columns are written; updated_at is stamped by onupdate
+            values = {
+                key: value
+                for key, value in update_data.items()
+                if key in _UPDATABLE_COLUMNS
+            }
+            if values:
+                result = db.execute(
+                    update(Document)
+                    .where(Document.id == document_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    db.rollback()
+                    return None
+                db.commit()
 
-            # Update attributes
-            for key, value in update_data.items():
-                setattr(document, key, value)
+            # No RETURNING on MySQL, so read the row back, leaving out the
+            # content blob the callers never return
+            row = db.execute(
+                select(*_LISTING_COLUMNS).where(Document.id == document_id)
+            ).one_or_none()
+            if not row:
+                return None
 
-            db.commit()
-            db.refresh(document)
-            return DocumentResponse.model_validate(document)
+            return DocumentResponse.model_validate(row)
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to update document {document_id}: {e}")
@@ -225,7 +334,7 @@ class DocumentRepository:
             True if document was deleted, False otherwise
         """
         try:
-            document = db.query(Document).filter(Document.id == document_id).first()
+            document = db.get(Document, document_id)
             if not document:
                 return False
 
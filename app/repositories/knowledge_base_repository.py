@@ -7,6 +7,7 @@ from sqlalchemy.orm import Session
 from app.db.models.conversation import Conversation
 from app.db.models.knowledge_base import Document, KnowledgeBase
 from app.db.models.message import Message
+from app.schemas._adapters import list_adapter_for
 from app.schemas.knowledge_base import KnowledgeBaseResponse
 
 logger = logging.getLogger(__name__)
@@ -32,7 +33,7 @@ class KnowledgeBaseRepository:
     async def get_by_id(kb_id: str, db: Session) -> Optional[KnowledgeBaseResponse]:
         """Get knowledge base by ID"""
         try:
-            kb = db.query(KnowledgeBase).filter(KnowledgeBase.id == kb_id).first()
+            kb = db.get(KnowledgeBase, kb_id)
             if not kb:
                 return None
             return KnowledgeBaseResponse.model_validate(kb)
@@ -45,7 +46,9 @@ class KnowledgeBaseRepository:
         """List all knowledge bases"""
         try:
             knowledge_bases = db.query(KnowledgeBase).all()
-            return [KnowledgeBaseResponse.model_validate(kb) for kb in knowledge_bases]
+            return list_adapter_for(KnowledgeBaseResponse).validate_python(
+                knowledge_bases
+            )
         except Exception as e:
             logger.error(f"Failed to list knowledge bases: {e}")
             raise
@@ -57,7 +60,9 @@ class KnowledgeBaseRepository:
             knowledge_bases = (
                 db.query(KnowledgeBase).filter(KnowledgeBase.user_id == owner_id).all()
             )
-            return [KnowledgeBaseResponse.model_validate(kb) for kb in knowledge_bases]
+            return list_adapter_for(KnowledgeBaseResponse).validate_python(
+                knowledge_bases
+            )
         except Exception as e:
             logger.error(f"Failed to list knowledge bases by owner {owner_id}: {e}")
             raise
@@ -68,7 +73,7 @@ class KnowledgeBaseRepository:
     ) -> Optional[KnowledgeBaseResponse]:
         """Update knowledge base"""
         try:
-            kb = db.query(KnowledgeBase).filter(KnowledgeBase.id == kb_id).first()
+            kb = db.get(KnowledgeBase, kb_id)
             if not kb:
                 return None
 
@@ -119,7 +124,7 @@ class KnowledgeBaseRepository:
             db.commit()
 
             # Finally delete the knowledge base itself
-            kb = db.query(KnowledgeBase).filter(KnowledgeBase.id == kb_id).first()
+            kb = db.get(KnowledgeBase, kb_id)
             if not kb:
                 return False
 
@@ -216,15 +221,12 @@ class KnowledgeBaseRepository:
             from app.schemas.user import UserResponse
 
             # Get the knowledge base to ensure it exists
-            kb = db.query(KnowledgeBase).filter(KnowledgeBase.id == kb_id).first()
+            kb = db.get(KnowledgeBase, kb_id)
             if not kb:
                 return []
 
             # Get all users who have access through the shared_with relationship
-            shared_users = [
-                UserResponse.model_validate(user) for user in kb.shared_with
-            ]
-            return shared_users
+            return list_adapter_for(UserResponse).validate_python(kb.shared_with)
         except Exception as e:
             logger.error(f"Failed to get shared users for knowledge base {kb_id}: {e}")
             raise
@@ -236,18 +238,15 @@ class KnowledgeBaseRepository:
         """List all knowledge bases shared with a specific user"""
         try:
 
-            query = text(f"""
+            query = text("""
                 SELECT kb.* FROM knowledge_bases kb
                 JOIN knowledge_base_sharing kbs ON kb.id = kbs.knowledge_base_id
-                WHERE kbs.user_id = '{user_id}'
+                WHERE kbs.user_id = :user_id
             """)
 
-            result = db.execute(query)
-            shared_kbs = []
-            for row in result:
-                shared_kbs.append(KnowledgeBaseResponse.model_validate(row))
-
-            return shared_kbs  # This will be an empty list if no shared knowledge bases exist
+            result = db.execute(query, {"user_id": user_id})
+            # An empty list if no knowledge bases are shared with the user
+            return list_adapter_for(KnowledgeBaseResponse).validate_python(result.all())
         except Exception as e:
             logger.error(
                 f"Failed to list knowledge bases shared with user {user_id}: {e}"
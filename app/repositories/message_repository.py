@@ -1,24 +1,45 @@
-import json
 import logging
 from typing import List, Optional
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
 from app.db.models.message import Message, MessageContentType, MessageStatus
+from app.schemas._adapters import list_adapter_for
 from app.schemas.message import MessageResponse
 
 logger = logging.getLogger(__name__)
 
+# Built once at import; SQLAlchemy caches the compiled form
+_SELECT_MESSAGES_BY_CONVERSATION = select(
+    Message.id,
+    Message.content,
+    Message.content_type,
+    Message.kind,
+    Message.user_id,
+    Message.conversation_id,
+    Message.knowledge_base_id,
+    Message.sources,
+    Message.message_metadata,
+    Message.status,
+    Message.created_at,
+    Message.updated_at,
+).where(Message.conversation_id == bindparam("conversation_id"))
+
 
 class MessageRepository:
     @staticmethod
-    async def create(message: Message, db: Session) -> Message:
+    async def create(message: Message, db: Session) -> MessageResponse:
         """Create a new message"""
         try:
+            # Flush the INSERT so defaults are populated, then build the
+            # response before commit expires the instance
             db.add(message)
+            db.flush()
+            response = MessageResponse.model_validate(message)
+
             db.commit()
-            db.refresh(message)
-            return message
+            return response
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to create message: {e}")
@@ -28,7 +49,7 @@ class MessageRepository:
     async def get_by_id(message_id: str, db: Session) -> Optional[MessageResponse]:
         """Get message by ID with ownership verification"""
         # First get the message
-        message = db.query(Message).filter(Message.id == message_id).first()
+        message = db.get(Message, message_id)
         if not message:
             return None
 
@@ -39,25 +60,27 @@ class MessageRepository:
         conversation_id: str, db: Session
     ) -> List[MessageResponse]:
         """List all messages in a conversation"""
-        messages = (
-            db.query(Message).filter(Message.conversation_id == conversation_id).all()
-        )
-        return [MessageResponse.model_validate(message) for message in messages]
+        # Project the response columns directly to skip ORM entity hydration
+        rows = db.execute(
+            _SELECT_MESSAGES_BY_CONVERSATION, {"conversation_id": conversation_id}
+        ).mappings()
+        return list_adapter_for(MessageResponse).validate_python(rows.all())
 
     @staticmethod
     async def update_with_sources(
         message_id: str, content: str, sources: List[dict], db: Session
     ) -> Optional[MessageResponse]:
         """Update message with response and sources"""
-        update_data = {
-            "content": content,
-            "sources": json.dumps(sources) if sources is not None else None,
-            "status": "completed",
-        }
-        db.query(Message).filter(Message.id == message_id).update(update_data)
+        message = db.get(Message, message_id)
+        if not message:
+            return None
+        message.content = content
+        # The JSON column serializes on flush; pre-encoding would double-encode
+        message.sources = sources
+        message.status = MessageStatus.PROCESSED
         db.commit()
-        db.refresh(message_id)
-        return MessageResponse.model_validate(message_id)
+        db.refresh(message)
+        return MessageResponse.model_validate(message)
 
     @staticmethod
     async def set_processed(
@@ -80,7 +103,7 @@ class MessageRepository:
             metadata: Optional metadata to store with the message
         """
         try:
-            message = db.query(Message).filter(Message.id == message_id).first()
+            message = db.get(Message, message_id)
             if not message:
                 raise ValueError(f"Message {message_id} not found")
             message.content = content
@@ -107,7 +130,7 @@ class MessageRepository:
     ) -> Optional[MessageResponse]:
         """Set message as failed"""
         try:
-            message = db.query(Message).filter(Message.id == message_id).first()
+            message = db.get(Message, message_id)
             if not message:
                 raise ValueError(f"Message {message_id} not found")
             message.content = error_message
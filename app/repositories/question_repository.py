@@ -1,13 +1,17 @@
 import logging
 from typing import Any, Dict, List, Optional
 
+from sqlalchemy import update
 from sqlalchemy.orm import Session
 
-from app.db.models.question import Question, QuestionStatus
-from app.schemas.question import QuestionResponse
+from app.db.models.question import Question
+from app.schemas._adapters import list_adapter_for
+from app.schemas.question import AnswerType, QuestionResponse, QuestionStatus
 
 logger = logging.getLogger(__name__)
 
+_UPDATABLE_COLUMNS = frozenset(Question.__table__.columns.keys()) - {"id", "created_at"}
+
 
 class QuestionRepository:
     """Repository for question operations"""
@@ -25,10 +29,23 @@ class QuestionRepository:
             Created question
         """
         try:
+            # Flush the INSERT so defaults are populated, then build the
+            # response before commit expires the instance
             db.add(question)
+            db.flush()
+
+            # The row was just written from validated input, so build the
+            # response without re-running validation
+            values = {
+                field: getattr(question, field)
+                for field in QuestionResponse.model_fields
+            }
+            values["answer_type"] = AnswerType(values["answer_type"])
+            values["status"] = QuestionStatus(values["status"])
+            response = QuestionResponse.model_construct(**values)
+
             db.commit()
-            db.refresh(question)
-            return QuestionResponse.model_validate(question)
+            return response
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to create question: {e}")
@@ -47,7 +64,7 @@ class QuestionRepository:
             Question if found, None otherwise
         """
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            question = db.get(Question, question_id)
             if not question:
                 return None
             return QuestionResponse.model_validate(question)
@@ -72,7 +89,7 @@ class QuestionRepository:
         """
         try:
             questions = db.query(Question).offset(skip).limit(limit).all()
-            return [QuestionResponse.model_validate(q) for q in questions]
+            return list_adapter_for(QuestionResponse).validate_python(questions)
         except Exception as e:
             logger.error(f"Failed to list all questions: {e}")
             raise
@@ -107,7 +124,7 @@ class QuestionRepository:
                 query = query.filter(Question.status == status)
 
             questions = query.offset(skip).limit(limit).all()
-            return [QuestionResponse.model_validate(q) for q in questions]
+            return list_adapter_for(QuestionResponse).validate_python(questions)
         except Exception as e:
             logger.error(f"Failed to list questions by knowledge base: {e}")
             raise
@@ -118,7 +135,7 @@ class QuestionRepository:
     ) -> Optional[QuestionResponse]:
         """Set question status to INGESTING"""
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            question = db.get(Question, question_id)
             if not question:
                 return None
 
@@ -138,7 +155,7 @@ class QuestionRepository:
     ) -> Optional[QuestionResponse]:
         """Set question status to COMPLETED"""
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            question = db.get(Question, question_id)
             if not question:
                 return None
 
@@ -156,7 +173,7 @@ class QuestionRepository:
     async def set_failed(question_id: str, db: Session) -> Optional[QuestionResponse]:
         """Set question status to FAILED"""
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            question = db.get(Question, question_id)
             if not question:
                 return None
 
@@ -170,6 +187,38 @@ class QuestionRepository:
             logger.error(f"Failed to set question to FAILED: {e}")
             raise
 
+    @staticmethod
+    async def set_status_bulk(
+        question_ids: List[str], status: QuestionStatus, db: Session
+    ) -> int:
+        """
+        Set the status of many questions in a single UPDATE and commit.
+
+        Args:
+            question_ids: IDs of the questions to update
+            status: New status
+            db: Database session
+
+        Returns:
+            Number of questions updated
+        """
+        if not question_ids:
+            return 0
+
+        try:
+            result = db.execute(
+                update(Question)
+                .where(Question.id.in_(question_ids))
+                .values(status=QuestionStatus(status).value)
+                .execution_options(synchronize_session=False)
+            )
+            db.commit()
+            return result.rowcount
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Failed to set status for {len(question_ids)} questions: {e}")
+            raise
+
     @staticmethod
     async def update(
         question_id: str, update_data: Dict[str, Any], db: Session
@@ -186,18 +235,29 @@ class QuestionRepository:
             Updated question
         """
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            # Only real columns are written; updated_at is stamped by onupdate
+            values = {
+                key: value
+                for key, value in update_data.items()
+                if key in _UPDATABLE_COLUMNS
+            }
+            if values:
+                result = db.execute(
+                    update(Question)
+                    .where(Question.id == question_id)
+                    .values(**values)
+                    .execution_options(synchronize_session=False)
+                )
+                if result.rowcount == 0:
+                    db.rollback()
+                    return None
+                db.commit()
+
+            # No RETURNING on MySQL, so read the row back by primary key
+            question = db.get(Question, question_id)
             if not question:
                 return None
 
-            for key, value in update_data.items():
-                if hasattr(question, key):
-                    setattr(question, key, value)
-
-            question.update_timestamp()
-            db.commit()
-            db.refresh(question)
-
             return QuestionResponse.model_validate(question)
         except Exception as e:
             db.rollback()
@@ -217,7 +277,7 @@ class QuestionRepository:
             True if successful, False otherwise
         """
         try:
-            question = db.query(Question).filter(Question.id == question_id).first()
+            question = db.get(Question, question_id)
             if not question:
                 return False
 
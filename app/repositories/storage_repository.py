@@ -17,29 +17,41 @@ class StorageRepository:
         table_name: str,
         create_table_query: str,
         columns: list[str],
-        data: list[dict],
+        data: list[list],
     ):
         """
         Insert CSV data into the storage database.
+
+        Rows are sent as a single parameterized executemany, which the MySQL
+        driver batches into multi-row INSERT statements.
         """
         logger.info(
-            f"Inserting CSV data into {table_name} with {len(data)} rows and {len(create_table_query)} columns"
+            f"Inserting CSV data into {table_name} with {len(data)} rows and {len(columns)} columns"
         )
         try:
             # create a table if it doesn't exist
-            logger.info(f"Create Table Query: {create_table_query}")
+            logger.debug(f"Create Table Query: {create_table_query}")
             db.execute(text(create_table_query))
-            logger.info(f"Successfully created table {table_name}")
-
-            # insert the data one by one
-            for row in data:
-                values_str = ", ".join(["'{}'".format(str(cell)) for cell in row])
-                columns_str = ", ".join(columns)
-                INSERT_ROW_QUERY = f"INSERT INTO {table_name} ({columns_str}) VALUES ({values_str})"
-                logger.info(f"Insert Row Query: {INSERT_ROW_QUERY}")
-                db.execute(text(INSERT_ROW_QUERY))
+            logger.debug(f"Successfully created table {table_name}")
+
+            # insert all rows in one batch with bound parameters
+            columns_str = ", ".join(columns)
+            placeholders = ", ".join(f":c{i}" for i in range(len(columns)))
+            INSERT_QUERY = (
+                f"INSERT INTO {table_name} ({columns_str}) VALUES ({placeholders})"
+            )
+            logger.debug(f"Insert Query: {INSERT_QUERY}")
+            params = [
+                {
+                    f"c{i}": str(row[i]) if i < len(row) else None
+                    for i in range(len(columns))
+                }
+                for row in data
+            ]
+            if params:
+                db.execute(text(INSERT_QUERY), params)
             db.commit()
-            logger.info(f"Successfully inserted CSV data into {table_name}")
+            logger.info(f"Successfully inserted {len(params)} rows into {table_name}")
             return True
         except Exception as e:
             db.rollback()
@@ -1,26 +1,89 @@
 import logging
+from functools import lru_cache
 from typing import List, Optional
 
+from sqlalchemy import bindparam, select
 from sqlalchemy.orm import Session
 
-from app.db.models.user import User
+from app.db.models.user import User, UserRole
+from app.schemas._adapters import list_adapter_for
 from app.schemas.user import UserResponse, UserUpdate
 
 logger = logging.getLogger(__name__)
 
+# Columns that make up a cached UserResponse; updated_at is part of the key so a
+# modified row never resolves to a stale response. The password hash is left out
+# of the cache and set on a fresh copy for every lookup
+_CACHED_USER_FIELDS = (
+    "id",
+    "email",
+    "full_name",
+    "role",
+    "is_active",
+    "updated_at",
+)
+_USER_RESPONSE_FIELDS = (*_CACHED_USER_FIELDS, "hashed_password")
+
+
+# Statements are built once at import; SQLAlchemy caches their compiled form
+_SELECT_USER_BY_EMAIL = (
+    select(*(getattr(User, field) for field in _USER_RESPONSE_FIELDS))
+    .where(User.email == bindparam("email"))
+    .limit(1)
+)
+_SELECT_USERS = select(
+    User.id,
+    User.email,
+    User.full_name,
+    User.role,
+    User.is_active,
+    User.hashed_password,
+)
+
+
+@lru_cache(maxsize=4096)
+def _validate_user_fields(fields: tuple) -> UserResponse:
+    """Validate user columns into a UserResponse, memoized on the column values"""
+    return UserResponse.model_validate(
+        {**dict(zip(_CACHED_USER_FIELDS, fields)), "hashed_password": ""}
+    )
+
+
+def _build_user_response(row: tuple) -> UserResponse:
+    """Build a UserResponse from a user row, as a copy callers are free to modify"""
+    *fields, hashed_password = row
+    return _validate_user_fields(tuple(fields)).model_copy(
+        update={"hashed_password": hashed_password}
+    )
+
+
+def _to_user_response(db_user: User) -> UserResponse:
+    """Convert a User entity using the memoized builder"""
+    return _build_user_response(
+        tuple(getattr(db_user, field) for field in _USER_RESPONSE_FIELDS)
+    )
+
 
 class UserRepository:
     @staticmethod
     async def create(user_data: User, db: Session) -> UserResponse:
         """Create a new user"""
         try:
-            # Add user to session and commit
+            # Flush the INSERT so defaults are populated, then build the
+            # response before commit expires the instance
             db.add(user_data)
-            db.commit()
-            db.refresh(user_data)
+            db.flush()
 
-            # Convert to response model
-            return UserResponse.model_validate(user_data)
+            # The row was just written from validated input, so build the
+            # response without re-running validation
+            values = {
+                field: getattr(user_data, field) for field in UserResponse.model_fields
+            }
+            values["role"] = UserRole(values["role"])
+            response = UserResponse.model_construct(**values)
+
+            db.commit()
+            return response
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to create user: {e}")
@@ -30,10 +93,10 @@ class UserRepository:
     async def get_by_id(user_id: str, db: Session) -> Optional[UserResponse]:
         """Get user by ID"""
         try:
-            db_user = db.query(User).filter(User.id == user_id).first()
+            db_user = db.get(User, user_id)
             if db_user is None:
                 return None
-            return UserResponse.model_validate(db_user)
+            return _to_user_response(db_user)
         except Exception as e:
             logger.error(f"Failed to get user by ID {user_id}: {e}")
             raise
@@ -42,10 +105,10 @@ class UserRepository:
     async def get_by_email(email: str, db: Session) -> Optional[UserResponse]:
         """Get user by email"""
         try:
-            db_user = db.query(User).filter(User.email == email).first()
-            if db_user is None:
+            row = db.execute(_SELECT_USER_BY_EMAIL, {"email": email}).first()
+            if row is None:
                 return None
-            return UserResponse.model_validate(db_user)
+            return _build_user_response(tuple(row))
         except Exception as e:
             logger.error(f"Failed to get user by email {email}: {e}")
             raise
@@ -54,8 +117,10 @@ class UserRepository:
     async def list_all(db: Session) -> List[UserResponse]:
         """List all users"""
         try:
-            db_users = db.query(User).all()
-            return [UserResponse.model_validate(user) for user in db_users]
+            # Project only the columns UserResponse needs instead of hydrating
+            # full ORM entities
+            rows = db.execute(_SELECT_USERS).mappings()
+            return list_adapter_for(UserResponse).validate_python(rows.all())
         except Exception as e:
             logger.error(f"Failed to list users: {e}")
             raise
@@ -67,7 +132,7 @@ class UserRepository:
         """Update user"""
         try:
             # Get the user
-            db_user = db.query(User).filter(User.id == user_id).first()
+            db_user = db.get(User, user_id)
             if db_user is None:
                 return None
 
@@ -80,7 +145,7 @@ class UserRepository:
             db.commit()
             db.refresh(db_user)
 
-            return UserResponse.model_validate(db_user)
+            return _to_user_response(db_user)
         except Exception as e:
             db.rollback()
             logger.error(f"Failed to update user {user_id}: {e}")
@@ -90,7 +155,7 @@ class UserRepository:
     async def delete(user_id: str, db: Session) -> bool:
         """Delete user"""
         try:
-            db_user = db.query(User).filter(User.id == user_id).first()
+            db_user = db.get(User, user_id)
             if db_user is None:
                 return False
 
@@ -0,0 +1,24 @@
+from functools import lru_cache
+from typing import List, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@lru_cache(maxsize=None)
+def list_adapter_for(model: Type[ModelT]) -> TypeAdapter[List[ModelT]]:
+    """
+    Get the shared TypeAdapter for a list of a response model.
+
+    Validating a whole list through one adapter runs the loop inside
+    pydantic-core instead of calling model_validate once per row. Adapters are
+    built on first use and cached per model.
+
+    Args:
+        model: Response model the list holds
+
+    Returns:
+        TypeAdapter validating a list of model instances
+    """
+    return TypeAdapter(List[model])
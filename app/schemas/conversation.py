@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 
 class ConversationBase(BaseModel):
@@ -34,5 +34,4 @@ class ConversationResponse(ConversationBase):
         ..., description="When the conversation was last updated"
     )
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,7 +1,7 @@
 from datetime import datetime
 from typing import Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 from app.db.models.knowledge_base import DocumentStatus, DocumentType
 
@@ -35,7 +35,10 @@ class DocumentResponse(DocumentBase):
 
     id: str = Field(..., description="ID of the document")
     user_id: str = Field(..., description="User ID of the document")
-    content: bytes = Field(..., description="Content of the document", exclude=True)
+    # None when loaded by a listing, which leaves the content column out
+    content: Optional[bytes] = Field(
+        default=None, description="Content of the document", exclude=True, repr=False
+    )
     size_bytes: int = Field(..., description="Size of the document in bytes")
     status: DocumentStatus = Field(..., description="Status of the document")
     error_message: Optional[str] = Field(
@@ -48,5 +51,4 @@ class DocumentResponse(DocumentBase):
     created_at: datetime = Field(..., description="Created timestamp")
     updated_at: datetime = Field(..., description="Last updated timestamp")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -1,15 +1,14 @@
 from datetime import datetime
 from typing import Annotated, Optional
 
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
-from app.db.models.knowledge_base import DocumentStatus
 from app.schemas.user import UserResponse
 
 
 class KnowledgeBaseBase(BaseModel):
-    name: str = Field(..., alias="name")
-    description: str = Field(..., alias="description")
+    name: str
+    description: str
 
 
 class KnowledgeBaseCreate(KnowledgeBaseBase):
@@ -26,8 +25,7 @@ class SharedUserInfo(BaseModel):
     email: str
     full_name: str
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class KnowledgeBaseResponse(KnowledgeBaseBase):
@@ -35,29 +33,9 @@ class KnowledgeBaseResponse(KnowledgeBaseBase):
     user_id: str
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
-    user: Optional[UserResponse] = Annotated[None, Field(exclude=True)]
+    user: Annotated[Optional[UserResponse], Field(exclude=True)] = None
 
-    class Config:
-        from_attributes = True
-
-
-class DocumentResponse(BaseModel):
-    id: str
-    filename: str
-    file_type: str
-    size_bytes: int
-    status: DocumentStatus
-    error_message: Optional[str] = None
-    knowledge_base_id: str
-    uploaded_by: str
-    created_at: datetime
-    updated_at: Optional[datetime] = None
-
-
-class DocumentUploadResponse(BaseModel):
-    document_id: str
-    status: DocumentStatus
-    message: str = "Document upload initiated"
+    model_config = ConfigDict(from_attributes=True)
 
 
 class KnowledgeBaseShareRequest(BaseModel):
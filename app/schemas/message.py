@@ -1,42 +1,57 @@
-import json
 from datetime import datetime
-from enum import Enum
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, Dict, List, Optional
 
-from pydantic import BaseModel, Field, model_validator
+from pydantic import BaseModel, ConfigDict, Field
+from typing_extensions import NotRequired, TypedDict
 
 from app.db.models.message import MessageContentType, MessageKind, MessageStatus
 
 
-class MessageType(str, Enum):
-    USER = "user"
-    ASSISTANT = "assistant"
-
-
-class MessageSource(BaseModel):
-    """Source document or question information"""
-
-    score: float = Field(..., description="Relevance score of the source")
-    content: str = Field(
-        ..., description="Relevant content from the document or question"
-    )
-
-    # Document-specific fields (optional for questions)
-    document_id: Optional[str] = Field(None, description="ID of the source document")
-    title: Optional[str] = Field(None, description="Title of the source document")
-    chunk_index: Optional[int] = Field(
-        None, description="Index of the chunk in the document"
-    )
-
-    # Question-specific fields (optional for documents)
-    question_id: Optional[str] = Field(None, description="ID of the source question")
-    question: Optional[str] = Field(None, description="The question that was matched")
-    answer: Optional[str] = Field(
-        None, description="The answer for the matched question"
-    )
-    answer_type: Optional[str] = Field(
-        None, description="Type of answer (DIRECT, SQL_QUERY, etc.)"
-    )
+class MessageSource(TypedDict):
+    """Source document or question information.
+
+    A TypedDict rather than a model: sources come from our own retrievers and
+    an assistant message carries many of them, so they are validated as plain
+    dicts without building a model per source. Fields a source does not have
+    are left out instead of being set to None.
+    """
+
+    score: Annotated[float, Field(description="Relevance score of the source")]
+    content: Annotated[
+        str, Field(description="Relevant content from the document or question")
+    ]
+
+    # Document-specific fields (absent for questions)
+    document_id: NotRequired[
+        Annotated[Optional[str], Field(description="ID of the source document")]
+    ]
+    title: NotRequired[
+        Annotated[Optional[str], Field(description="Title of the source document")]
+    ]
+    chunk_index: NotRequired[
+        Annotated[
+            Optional[int], Field(description="Index of the chunk in the document")
+        ]
+    ]
+
+    # Question-specific fields (absent for documents)
+    question_id: NotRequired[
+        Annotated[Optional[str], Field(description="ID of the source question")]
+    ]
+    question: NotRequired[
+        Annotated[Optional[str], Field(description="The question that was matched")]
+    ]
+    answer: NotRequired[
+        Annotated[
+            Optional[str], Field(description="The answer for the matched question")
+        ]
+    ]
+    answer_type: NotRequired[
+        Annotated[
+            Optional[str],
+            Field(description="Type of answer (DIRECT, SQL_QUERY, etc.)"),
+        ]
+    ]
 
 
 class MessageBase(BaseModel):
@@ -78,19 +93,7 @@ class MessageResponse(MessageBase):
     created_at: datetime = Field(..., description="When the message was created")
     updated_at: datetime = Field(..., description="When the message was last updated")
 
-    @model_validator(mode="after")
-    def parse_message_metadata(self) -> "MessageResponse":
-        """Parse message_metadata if it's a string"""
-        if self.message_metadata and isinstance(self.message_metadata, str):
-            try:
-                self.message_metadata = json.loads(self.message_metadata)
-            except json.JSONDecodeError:
-                # If we can't parse it as JSON, set it to None
-                self.message_metadata = None
-        return self
-
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class MessageProcessingResponse(BaseModel):
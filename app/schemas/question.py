@@ -2,7 +2,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
-from pydantic import BaseModel
+from pydantic import BaseModel, ConfigDict
 
 
 class AnswerType(str, Enum):
@@ -47,20 +47,4 @@ class QuestionResponse(QuestionBase):
     created_at: Optional[datetime] = None
     updated_at: Optional[datetime] = None
 
-    class Config:
-        from_attributes = True
-
-    @classmethod
-    def model_validate(cls, obj):
-        """Custom validation to handle SQLAlchemy model to Pydantic conversion"""
-        # Convert string status to enum
-        if hasattr(obj, "status") and isinstance(obj.status, str):
-            status = obj.status
-            obj.status = QuestionStatus(status)
-
-        # Convert string answer_type to enum
-        if hasattr(obj, "answer_type") and isinstance(obj.answer_type, str):
-            answer_type = obj.answer_type
-            obj.answer_type = AnswerType(answer_type)
-
-        return super().model_validate(obj)
+    model_config = ConfigDict(from_attributes=True)
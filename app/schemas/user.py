@@ -1,58 +1,57 @@
 from typing import Annotated, List, Optional
 
-from pydantic import BaseModel, EmailStr, Field
+from pydantic import BaseModel, ConfigDict, EmailStr, Field
 
 from app.db.models.user import UserRole
 
 
 class UserBase(BaseModel):
-    email: EmailStr = Field(..., alias="email")
-    full_name: str = Field(..., alias="full_name")
+    email: EmailStr
+    full_name: str
     role: UserRole = Field(default=UserRole.USER)
 
 
 class UserCreate(UserBase):
-    password: str = Field(..., alias="password")
+    password: str
 
 
 class UserLogin(BaseModel):
-    email: EmailStr = Field(..., alias="email")
-    password: str = Field(..., alias="password")
+    email: EmailStr
+    password: str
 
 
 class UserUpdate(BaseModel):
-    email: Optional[EmailStr] = Field(default=None, alias="email")
-    full_name: Optional[str] = Field(default=None, alias="full_name")
-    password: Optional[str] = Field(default=None, alias="password")
+    email: Optional[EmailStr] = None
+    full_name: Optional[str] = None
+    password: Optional[str] = None
     role: UserRole = Field(default=UserRole.USER)
 
 
 class Token(BaseModel):
-    access_token: str = Field(..., alias="access_token")
-    token_type: str = Field(default="bearer", alias="token_type")
+    access_token: str
+    token_type: str = "bearer"
 
 
 class TokenData(BaseModel):
-    email: Optional[str] = Field(default=None, alias="email")
-    role: Optional[str] = Field(default=None, alias="role")
+    email: Optional[str] = None
+    role: Optional[str] = None
 
 
 class PasswordReset(BaseModel):
-    email: EmailStr = Field(..., alias="email")
+    email: EmailStr
 
 
 class PasswordResetConfirm(BaseModel):
-    token: str = Field(..., alias="token")
+    token: str
     new_password: str = Field(..., min_length=8)
 
 
 class UserResponse(UserBase):
-    id: str = Field(..., alias="id")
-    is_active: bool = Field(..., alias="is_active")
-    hashed_password: str = Annotated[str, Field(exclude=True)]
+    id: str
+    is_active: bool
+    hashed_password: Annotated[str, Field(exclude=True, repr=False)]
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class UserWithPermissions(UserResponse):
@@ -62,5 +61,4 @@ class UserWithPermissions(UserResponse):
         ..., description="List of permissions the user has based on their role"
     )
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
@@ -29,68 +29,58 @@ class ConversationService:
         self.kb_service = knowledge_base_service
         self.db = db
 
+    # Unexpected errors are not caught here: the repositories log them and
+    # UnhandledErrorMiddleware (app.core.middleware), mounted inside CORS,
+    # turns them into a 500 response.
+
     async def create_conversation(
         self, payload: ConversationCreate, current_user: UserResponse
     ) -> ConversationResponse:
         """Create a new conversation"""
-        try:
-            # Verify knowledge base access
-            await self.kb_service.get_knowledge_base(
-                payload.knowledge_base_id, current_user
-            )
-            conversation = Conversation(
-                title=payload.title,
-                knowledge_base_id=payload.knowledge_base_id,
-                user_id=current_user.id,
-            )
-            logger.info(f"Creating conversation for user {current_user.id}")
-            conversation: ConversationResponse = await self.repository.create(
-                conversation, self.db
-            )
-            logger.info(
-                f"Conversation {conversation.id} created by user {current_user.id}"
-            )
-            return conversation
-        except Exception as e:
-            logger.error(f"Failed to create conversation: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        # Verify knowledge base access
+        await self.kb_service.get_knowledge_base(
+            payload.knowledge_base_id, current_user
+        )
+        conversation = Conversation(
+            title=payload.title,
+            knowledge_base_id=payload.knowledge_base_id,
+            user_id=current_user.id,
+        )
+        logger.info("Creating conversation for user %s", current_user.id)
+        conversation: ConversationResponse = await self.repository.create(
+            conversation, self.db
+        )
+        logger.info(
+            "Conversation %s created by user %s", conversation.id, current_user.id
+        )
+        return conversation
 
     async def list_conversations(
         self, current_user: UserResponse
     ) -> List[ConversationResponse]:
         """List all conversations for the current user"""
-        try:
-            logger.info(f"Listing conversations for user {current_user.id}")
-            conversations: List[ConversationResponse] = (
-                await self.repository.list_by_user(current_user, self.db)
-            )
-            logger.info(
-                f"Retrieved {len(conversations)} conversations for user {current_user.id}"
-            )
-            return conversations
-        except Exception as e:
-            logger.error(
-                f"Failed to list conversations for user {current_user.id}: {e}"
-            )
-            raise HTTPException(status_code=500, detail=str(e))
+        logger.info("Listing conversations for user %s", current_user.id)
+        conversations: List[ConversationResponse] = await self.repository.list_by_user(
+            current_user, self.db
+        )
+        logger.info(
+            "Retrieved %d conversations for user %s",
+            len(conversations),
+            current_user.id,
+        )
+        return conversations
 
     async def get_conversation(
         self, conversation_id: str, current_user: UserResponse
     ) -> ConversationResponse:
         """Get conversation details"""
-        try:
-            conversation: Optional[ConversationResponse] = (
-                await self.repository.get_by_id(conversation_id, current_user, self.db)
-            )
-            if not conversation:
-                logger.warning(f"Conversation {conversation_id} not found")
-                raise HTTPException(status_code=404, detail="Conversation not found")
-            return conversation
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to get conversation {conversation_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        conversation: Optional[ConversationResponse] = await self.repository.get_by_id(
+            conversation_id, current_user, self.db
+        )
+        if not conversation:
+            logger.warning("Conversation %s not found", conversation_id)
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        return conversation
 
     async def update_conversation(
         self,
@@ -99,51 +89,24 @@ class ConversationService:
         current_user: UserResponse,
     ) -> ConversationResponse:
         """Update conversation details"""
-        try:
-            # Verify ownership
-            conversation: ConversationResponse = await self.get_conversation(
-                conversation_id, current_user
-            )
-            if not conversation:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-
-            # Update conversation
-            updated_conversation = await self.repository.update(
-                conversation_id, conversation_update, current_user
-            )
-            if updated_conversation:
-                logger.info(
-                    f"Conversation {conversation_id} updated by user {current_user.id}"
-                )
-                return updated_conversation
+        # The repository only updates conversations the user owns
+        updated_conversation = await self.repository.update(
+            conversation_id, conversation_update, current_user, self.db
+        )
+        if not updated_conversation:
             raise HTTPException(status_code=404, detail="Conversation not found")
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to update conversation {conversation_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        logger.info(
+            "Conversation %s updated by user %s", conversation_id, current_user.id
+        )
+        return updated_conversation
 
     async def delete_conversation(
         self, conversation_id: str, current_user: UserResponse
     ) -> None:
         """Delete conversation and all its messages"""
-        try:
-            # Verify ownership
-            conversation: ConversationResponse = await self.get_conversation(
-                conversation_id, current_user
-            )
-            if not conversation:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-
-            # Delete conversation (cascade will handle messages)
-            if await self.repository.delete(conversation_id, current_user):
-                logger.info(
-                    f"Conversation {conversation_id} deleted by user {current_user.id}"
-                )
-            else:
-                raise HTTPException(status_code=404, detail="Conversation not found")
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to delete conversation {conversation_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        # The repository only deletes conversations the user owns
+        if not await self.repository.delete(conversation_id, current_user, self.db):
+            raise HTTPException(status_code=404, detail="Conversation not found")
+        logger.info(
+            "Conversation %s deleted by user %s", conversation_id, current_user.id
+        )
@@ -1,5 +1,7 @@
+import functools
+import inspect
 import logging
-from typing import List
+from typing import List, Tuple
 
 from celery import Celery
 from fastapi import HTTPException
@@ -9,6 +11,7 @@ from app.db.models.knowledge_base import Document, DocumentStatus, DocumentType
 from app.db.models.user import UserRole
 from app.repositories.document_repository import DocumentRepository
 from app.schemas.document import DocumentResponse, DocumentUpdate, DocumentUpload
+from app.schemas.knowledge_base import KnowledgeBaseResponse
 from app.schemas.user import UserResponse
 from app.services.knowledge_base_service import FileStorage, KnowledgeBaseService
 from app.services.rag.vector_store import VectorStore
@@ -16,6 +19,63 @@ from app.services.rag.vector_store import VectorStore
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# Document type for each exact content type
+_CONTENT_TYPES = {
+    "application/pdf": DocumentType.PDF,
+    "image/jpg": DocumentType.JPG,
+    "image/jpeg": DocumentType.JPG,
+    "image/png": DocumentType.PNG,
+    "image/gif": DocumentType.GIF,
+    "image/tiff": DocumentType.TIFF,
+    DocumentType.DOCX.value: DocumentType.DOCX,
+    "application/msword": DocumentType.DOC,
+    "text/csv": DocumentType.CSV,
+    "text/plain": DocumentType.TXT,
+}
+# Substrings checked in order for any other content type, e.g. one with
+# parameters such as "text/csv; charset=utf-8"
+_CONTENT_TYPE_MARKERS = (
+    ("pdf", DocumentType.PDF),
+    ("image/jpg", DocumentType.JPG),
+    ("image/jpeg", DocumentType.JPG),
+    ("image/png", DocumentType.PNG),
+    ("image/gif", DocumentType.GIF),
+    ("image/tiff", DocumentType.TIFF),
+    (DocumentType.DOCX.value, DocumentType.DOCX),
+    ("application/msword", DocumentType.DOC),
+    ("text/csv", DocumentType.CSV),
+)
+
+
+def _handle_service_errors(message: str):
+    """
+    Turn unexpected errors of a service method into a 500 response.
+
+    HTTPExceptions pass through unchanged. Anything else is logged with its
+    traceback and message, formatted with the method's arguments, e.g.
+    "{doc_id}". The client only sees a generic detail.
+    """
+
+    def decorator(method):
+        signature = inspect.signature(method)
+
+        @functools.wraps(method)
+        async def wrapper(*args, **kwargs):
+            try:
+                return await method(*args, **kwargs)
+            except HTTPException:
+                raise
+            except Exception as e:
+                arguments = signature.bind(*args, **kwargs).arguments
+                logger.exception(f"{message.format(**arguments)}: {e}")
+                raise HTTPException(
+                    status_code=500, detail="Internal server error"
+                ) from e
+
+        return wrapper
+
+    return decorator
+
 
 class DocumentService:
     def __init__(
@@ -34,86 +94,107 @@ class DocumentService:
         self.celery_app = celery_app
         self.db = db
 
+    @_handle_service_errors("Failed to create document in knowledge base {kb_id}")
     async def create_document(
         self, kb_id: str, payload: DocumentUpload, current_user: UserResponse
     ) -> DocumentResponse:
         """Create a new document in a knowledge base"""
-        # file_path = None
-        try:
-            # Check knowledge base access
-            await self.kb_service.get_knowledge_base(kb_id, current_user)
-
-            # Check the number of documents in the knowledge base
-            existing_docs = await self.document_repository.list_by_knowledge_base(
-                kb_id, self.db
+        # Check knowledge base access
+        await self.kb_service.get_knowledge_base(kb_id, current_user)
+
+        # Check the number of documents in the knowledge base
+        document_count = await self.document_repository.count_by_knowledge_base(
+            kb_id, self.db
+        )
+        if document_count >= 20:
+            raise HTTPException(
+                status_code=400,
+                detail="Maximum number of documents (20) reached for this knowledge base",
             )
-            if len(existing_docs) >= 20:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Maximum number of documents (20) reached for this knowledge base",
-                )
 
-            # # Save file temporarily and get content
-            # file_path = await self.file_storage.save_file(payload.title)
-            # async with aiofiles.open(file_path, 'rb') as f:
-            #     content = await f.read()
-
-            # Create document record
-            document = await self._create_document_record(
-                kb_id=kb_id,
-                title=payload.title,
-                content_type=self._detect_document_type(payload.content_type),
-                content=payload.content,
-                user_id=str(current_user.id),
+        # Create document record
+        document = await self._create_document_record(
+            kb_id=kb_id,
+            title=payload.title,
+            content_type=self._detect_document_type(payload.content_type),
+            content=payload.content,
+            user_id=current_user.id,
+        )
+
+        # Queue document processing task
+        self.celery_app.send_task(
+            "app.worker.tasks.initiate_document_ingestion", args=[document.id]
+        )
+
+        return document
+
+    @_handle_service_errors("Failed to create documents in knowledge base {kb_id}")
+    async def create_documents(
+        self, kb_id: str, payloads: List[DocumentUpload], current_user: UserResponse
+    ) -> List[DocumentResponse]:
+        """Create several documents in a knowledge base with a single insert"""
+        # Check knowledge base access
+        await self.kb_service.get_knowledge_base(kb_id, current_user)
+
+        # Check the whole batch fits within the document limit
+        document_count = await self.document_repository.count_by_knowledge_base(
+            kb_id, self.db
+        )
+        if document_count + len(payloads) > 20:
+            raise HTTPException(
+                status_code=400,
+                detail="Maximum number of documents (20) reached for this knowledge base",
             )
 
-            # Queue document processing task
+        user_id = current_user.id
+        documents = await self.document_repository.create_many(
+            [
+                self._new_document(
+                    kb_id=kb_id,
+                    title=payload.title,
+                    content_type=self._detect_document_type(payload.content_type),
+                    content=payload.content,
+                    user_id=user_id,
+                )
+                for payload in payloads
+            ],
+            self.db,
+        )
+
+        # Queue processing per document so each one keeps its own retries
+        # and status
+        for document in documents:
             self.celery_app.send_task(
                 "app.worker.tasks.initiate_document_ingestion", args=[document.id]
             )
 
-            return document
-
-        except Exception as e:
-            logger.error(f"Failed to create document in service: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-        # finally:
-        #     if file_path:
-        #         self.file_storage.cleanup_file(file_path)
+        return documents
 
     def _detect_document_type(self, content_type: str) -> DocumentType:
         """Detect document type from content type"""
         content_type = content_type.lower()
-        if "pdf" in content_type:
-            return DocumentType.PDF
-        if "image/jpg" in content_type or "image/jpeg" in content_type:
-            return DocumentType.JPG
-        if "image/png" in content_type:
-            return DocumentType.PNG
-        if "image/gif" in content_type:
-            return DocumentType.GIF
-        if "image/tiff" in content_type:
-            return DocumentType.TIFF
-        if (
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-            in content_type
-        ):
-            return DocumentType.DOCX
-        if "application/msword" in content_type:
-            return DocumentType.DOC
-        if "text/csv" in content_type:
-            return DocumentType.CSV
-        if "text/plain" in content_type:
-            return DocumentType.TXT
+        document_type = _CONTENT_TYPES.get(content_type)
+        if document_type is not None:
+            return document_type
+        for marker, document_type in _CONTENT_TYPE_MARKERS:
+            if marker in content_type:
+                return document_type
         return DocumentType.TXT
 
     async def _create_document_record(
         self, kb_id: str, title: str, content_type: str, content: bytes, user_id: str
     ) -> DocumentResponse:
-        """Create document record with encoded content"""
-        # content_base64 = base64.b64encode(content).decode('utf-8')
+        """Create document record with the raw file content"""
+        document = self._new_document(kb_id, title, content_type, content, user_id)
+        logger.info(f"Creating document record: {document}")
+        return await self.document_repository.create(document, self.db)
 
-        document = Document(
+    @staticmethod
+    def _new_document(
+        kb_id: str, title: str, content_type: str, content: bytes, user_id: str
+    ) -> Document:
+        """Build a pending document for upload"""
+        return Document(
             title=title,
             knowledge_base_id=kb_id,
             content_type=content_type,
@@ -122,145 +203,111 @@ class DocumentService:
             user_id=user_id,
             status=DocumentStatus.PENDING,
         )
-        logger.info(f"Creating document record: {document}")
-        return await self.document_repository.create(document, self.db)
 
+    @_handle_service_errors("Failed to get document {doc_id}")
     async def get_document(self, doc_id: str, current_user: UserResponse) -> Document:
         """Get document details"""
-        try:
-            doc = await self.document_repository.get_by_id(doc_id, self.db)
-            if not doc:
-                raise HTTPException(status_code=404, detail="Document not found")
-
-            # Check access through knowledge base
-            await self.kb_service.get_knowledge_base(
-                doc.knowledge_base_id, current_user
-            )
-
-            return doc
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to get document {doc_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
-
+        doc, _ = await self._get_document_and_knowledge_base(doc_id, current_user)
+        return doc
+
+    async def _get_document_and_knowledge_base(
+        self, doc_id: str, current_user: UserResponse
+    ) -> Tuple[DocumentResponse, KnowledgeBaseResponse]:
+        """Get a document and its knowledge base in one query, checking access"""
+        found = await self.document_repository.get_with_knowledge_base(doc_id, self.db)
+        if not found:
+            raise HTTPException(status_code=404, detail="Document not found")
+
+        doc, kb = found
+        await self.kb_service.check_access(kb, current_user)
+        return doc, kb
+
+    @_handle_service_errors("Failed to list documents for knowledge base {kb_id}")
     async def list_documents(
         self, kb_id: str, current_user: UserResponse
     ) -> List[DocumentResponse]:
         """List all documents in a knowledge base"""
-        try:
-            # Check access
-            await self.kb_service.get_knowledge_base(kb_id, current_user)
-            return await self.document_repository.list_by_knowledge_base(kb_id, self.db)
-        except Exception as e:
-            logger.error(f"Failed to list documents for knowledge base {kb_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        # Check access
+        await self.kb_service.get_knowledge_base(kb_id, current_user)
+        return await self.document_repository.list_by_knowledge_base(kb_id, self.db)
 
+    @_handle_service_errors("Failed to update document {doc_id}")
     async def update_document(
         self, doc_id: str, doc_update: DocumentUpdate, current_user: UserResponse
     ) -> Document:
         """Update document metadata"""
-        try:
-            # Get document and check access
-            doc = await self.get_document(doc_id, current_user)
-            kb = await self.kb_service.get_knowledge_base(
-                doc.knowledge_base_id, current_user
-            )
-
-            # Only owner or admin can update
-            if current_user.role != UserRole.ADMIN and str(kb.user_id) != str(
-                current_user.id
-            ):
-                raise HTTPException(status_code=403, detail="Not enough privileges")
+        # Get document and its knowledge base, checking access
+        _, kb = await self._get_document_and_knowledge_base(doc_id, current_user)
 
-            # Update document
-            update_data = doc_update.model_dump(exclude_unset=True)
-            updated_doc = await self.document_repository.update(
-                doc_id, update_data, self.db
-            )
-            if not updated_doc:
-                raise HTTPException(status_code=404, detail="Document not found")
+        # Only owner or admin can update
+        if current_user.role != UserRole.ADMIN and kb.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not enough privileges")
 
-            logger.info(f"Document {doc_id} updated")
-            return updated_doc
+        # Update document
+        update_data = doc_update.model_dump(exclude_unset=True)
+        updated_doc = await self.document_repository.update(
+            doc_id, update_data, self.db
+        )
+        if not updated_doc:
+            raise HTTPException(status_code=404, detail="Document not found")
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to update document {doc_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        logger.info(f"Document {doc_id} updated")
+        return updated_doc
 
+    @_handle_service_errors("Failed to delete document {doc_id}")
     async def delete_document(self, doc_id: str, current_user: UserResponse) -> None:
         """Delete a document and its vectors"""
-        try:
-            # Get document and check access
-            doc = await self.get_document(doc_id, current_user)
-            kb = await self.kb_service.get_knowledge_base(
-                doc.knowledge_base_id, current_user
-            )
+        # Get document and its knowledge base, checking access
+        _, kb = await self._get_document_and_knowledge_base(doc_id, current_user)
 
-            # Only owner or admin can delete
-            if current_user.role != UserRole.ADMIN and str(kb.user_id) != str(
-                current_user.id
-            ):
-                raise HTTPException(status_code=403, detail="Not enough privileges")
-
-            # Queue vector deletion task
-            self.celery_app.send_task(
-                "app.worker.tasks.initiate_document_vector_deletion", args=[doc_id]
-            )
+        # Only owner or admin can delete
+        if current_user.role != UserRole.ADMIN and kb.user_id != current_user.id:
+            raise HTTPException(status_code=403, detail="Not enough privileges")
 
-            # Delete document
-            success = await self.document_repository.delete(doc_id, self.db)
-            if not success:
-                raise HTTPException(status_code=404, detail="Document not found")
+        # Queue vector deletion task
+        self.celery_app.send_task(
+            "app.worker.tasks.initiate_document_vector_deletion", args=[doc_id]
+        )
 
-            logger.info(f"Document {doc_id} deleted")
+        # Delete document
+        success = await self.document_repository.delete(doc_id, self.db)
+        if not success:
+            raise HTTPException(status_code=404, detail="Document not found")
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to delete document {doc_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        logger.info(f"Document {doc_id} deleted")
 
+    @_handle_service_errors("Failed to retry document processing for {doc_id}")
     async def retry_failed_document(
         self, kb_id: str, doc_id: str, current_user: UserResponse
     ) -> DocumentResponse:
         """Retry processing a failed document"""
-        try:
-            # Get document and check access
-            doc = await self.get_document(doc_id, current_user)
-
-            # Verify this document belongs to the specified knowledge base
-            if doc.knowledge_base_id != kb_id:
-                raise HTTPException(
-                    status_code=400,
-                    detail="Document does not belong to the specified knowledge base",
-                )
-
-            # Check if document is in a failed state
-            if doc.status != DocumentStatus.FAILED:
-                raise HTTPException(
-                    status_code=400,
-                    detail=f"Only failed documents can be retried. Current status: {doc.status}",
-                )
-
-            # Update document status back to pending
-            update_data = {"status": DocumentStatus.PENDING, "error_message": None}
-            updated_doc = await self.document_repository.update(
-                doc_id, update_data, self.db
+        # Get document and check access
+        doc = await self.get_document(doc_id, current_user)
+
+        # Verify this document belongs to the specified knowledge base
+        if doc.knowledge_base_id != kb_id:
+            raise HTTPException(
+                status_code=400,
+                detail="Document does not belong to the specified knowledge base",
             )
 
-            # Queue document processing task
-            self.celery_app.send_task(
-                "app.worker.tasks.initiate_document_ingestion", args=[doc_id]
+        # Check if document is in a failed state
+        if doc.status != DocumentStatus.FAILED:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Only failed documents can be retried. Current status: {doc.status}",
             )
 
-            logger.info(f"Retrying processing for document {doc_id}")
-            return updated_doc
+        # Update document status back to pending
+        update_data = {"status": DocumentStatus.PENDING, "error_message": None}
+        updated_doc = await self.document_repository.update(
+            doc_id, update_data, self.db
+        )
+
+        # Queue document processing task
+        self.celery_app.send_task(
+            "app.worker.tasks.initiate_document_ingestion", args=[doc_id]
+        )
 
-        except HTTPException:
-            raise
-        except Exception as e:
-            logger.error(f"Failed to retry document processing for {doc_id}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+        logger.info(f"Retrying processing for document {doc_id}")
+        return updated_doc
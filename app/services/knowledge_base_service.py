@@ -1,9 +1,10 @@
+import asyncio
 import logging
 import os
+import shutil
 from datetime import datetime
-from typing import List, Protocol
+from typing import BinaryIO, Dict, List, Protocol, Tuple
 
-import aiofiles
 from celery import Celery
 from fastapi import HTTPException, UploadFile
 from sqlalchemy.orm import Session
@@ -46,12 +47,17 @@ class LocalFileStorage:
         safe_filename = f"{timestamp}_{file.filename}"
         file_path = os.path.join(self.upload_dir, safe_filename)
 
-        async with aiofiles.open(file_path, "wb") as out_file:
-            content = await file.read()
-            await out_file.write(content)
+        # Copy the spooled upload in chunks on one worker thread instead of
+        # reading it whole into memory first
+        await asyncio.to_thread(self._copy_to, file.file, file_path)
 
         return file_path
 
+    @staticmethod
+    def _copy_to(source: BinaryIO, file_path: str) -> None:
+        with open(file_path, "wb") as out_file:
+            shutil.copyfileobj(source, out_file)
+
     def cleanup_file(self, file_path: str) -> None:
         try:
             if os.path.exists(file_path):
@@ -76,6 +82,10 @@ class KnowledgeBaseService:
         self.file_storage = file_storage
         self.celery_app = celery_app
         self.db = db
+        # Knowledge bases already granted by get_knowledge_base, keyed by
+        # (kb_id, user_id). Services are built per request, so entries never
+        # outlive the request that checked them.
+        self._granted: Dict[Tuple[str, str], KnowledgeBaseResponse] = {}
 
     async def create_knowledge_base(
         self, kb_data: KnowledgeBaseCreate, current_user: UserResponse
@@ -99,12 +109,26 @@ class KnowledgeBaseService:
         self, kb_id: str, current_user: UserResponse
     ) -> KnowledgeBaseResponse:
         """Get a knowledge base by ID"""
+        key = (kb_id, current_user.id)
+        if key in self._granted:
+            return self._granted[key]
+
         kb = await self.repository.get_by_id(kb_id, self.db)
         if not kb:
             raise HTTPException(status_code=404, detail="Knowledge base not found")
 
+        return await self.check_access(kb, current_user)
+
+    async def check_access(
+        self, kb: KnowledgeBaseResponse, current_user: UserResponse
+    ) -> KnowledgeBaseResponse:
+        """Check the user can access an already loaded knowledge base"""
+        key = (kb.id, current_user.id)
+        if key in self._granted:
+            return self._granted[key]
+
         # Check if user has access
-        if str(kb.user_id) != str(current_user.id):
+        if kb.user_id != current_user.id:
             # Check if user is an admin or owner (role-based access)
             if (
                 current_user.role != UserRole.ADMIN
@@ -112,7 +136,7 @@ class KnowledgeBaseService:
             ):
                 # Check if the KB is explicitly shared with this user
                 is_shared = await self.repository.is_shared_with_user(
-                    kb_id, current_user.id, self.db
+                    kb.id, current_user.id, self.db
                 )
                 if not is_shared:
                     raise HTTPException(
@@ -120,6 +144,7 @@ class KnowledgeBaseService:
                         detail="You don't have access to this knowledge base",
                     )
 
+        self._granted[key] = kb
         return kb
 
     async def list_knowledge_bases(
@@ -145,10 +170,7 @@ class KnowledgeBaseService:
             raise HTTPException(status_code=404, detail="Knowledge base not found")
 
         # Check if user has permission to update
-        if (
-            str(kb.user_id) != str(current_user.id)
-            and current_user.role != UserRole.ADMIN
-        ):
+        if kb.user_id != current_user.id and current_user.role != UserRole.ADMIN:
             raise HTTPException(
                 status_code=403,
                 detail="You don't have permission to update this knowledge base",
@@ -158,6 +180,7 @@ class KnowledgeBaseService:
             updated_kb = await self.repository.update(
                 self.db, kb_id=kb_id, name=kb_data.name, description=kb_data.description
             )
+            self._granted.clear()
             return updated_kb
         except Exception as e:
             logger.error(f"Error updating knowledge base: {str(e)}")
@@ -174,24 +197,20 @@ class KnowledgeBaseService:
             raise HTTPException(status_code=404, detail="Knowledge base not found")
 
         # Check if user has permission to delete
-        if (
-            str(kb.user_id) != str(current_user.id)
-            and current_user.role != UserRole.ADMIN
-        ):
+        if kb.user_id != current_user.id and current_user.role != UserRole.ADMIN:
             raise HTTPException(
                 status_code=403,
                 detail="You don't have permission to delete this knowledge base",
             )
 
         try:
-            # Delete all documents in the knowledge base
-            documents = await self.repository.get_documents(kb_id, self.db)
-            for doc in documents:
-                # Delete document vectors
-                await self.vector_store.delete_document_chunks(doc.id, kb_id)
+            # Delete the vectors of every document in one request rather than
+            # one per document
+            await self.vector_store.delete_knowledge_base_chunks(kb_id)
 
             # Delete the knowledge base (this will cascade delete documents)
             await self.repository.delete(kb_id, self.db)
+            self._granted.clear()
         except Exception as e:
             logger.error(f"Error deleting knowledge base: {str(e)}")
             raise HTTPException(
@@ -209,7 +228,7 @@ class KnowledgeBaseService:
 
         # Check if the current user has permission to share
         if (
-            str(kb.user_id) != str(current_user.id)
+            kb.user_id != current_user.id
             and current_user.role != UserRole.ADMIN
             and current_user.role != UserRole.OWNER
         ):
@@ -254,7 +273,7 @@ class KnowledgeBaseService:
 
         # Check if the current user has permission to unshare
         if (
-            str(kb.user_id) != str(current_user.id)
+            kb.user_id != current_user.id
             and current_user.role != UserRole.ADMIN
             and current_user.role != UserRole.OWNER
         ):
@@ -266,6 +285,7 @@ class KnowledgeBaseService:
         try:
             # Remove the sharing relationship
             await self.repository.remove_user_access(kb_id, user_id, self.db)
+            self._granted.clear()
             return True
         except Exception as e:
             logger.error(f"Error unsharing knowledge base: {str(e)}")
@@ -282,7 +302,7 @@ class KnowledgeBaseService:
 
         # Check if the current user has permission to view sharing info
         if (
-            str(kb.user_id) != str(current_user.id)
+            kb.user_id != current_user.id
             and current_user.role != UserRole.ADMIN
             and current_user.role != UserRole.OWNER
         ):
@@ -6,9 +6,11 @@ It abstracts away the specific LLM provider implementations to allow easy switch
 """
 
 import logging
+import time
 from abc import ABC, abstractmethod
+from collections import OrderedDict
 from enum import Enum
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Dict, List, Literal, Optional, Tuple, Union
 
 from pydantic import BaseModel, Field
 
@@ -349,6 +351,19 @@ class AnthropicProvider(LLMProvider):
             raise
 
 
+# ----- Query Embedding Cache -----
+
+# Most recent query embeddings kept per process, and how long one stays valid
+# (bounded so a change of embedding model or deployment is picked up)
+QUERY_EMBEDDING_CACHE_SIZE = 1024
+QUERY_EMBEDDING_CACHE_TTL_SECONDS = 600
+
+# (model, normalized query) -> (expiry time, embedding), oldest first
+_query_embedding_cache: "OrderedDict[Tuple[str, str], Tuple[float, List[float]]]" = (
+    OrderedDict()
+)
+
+
 # ----- Factory Implementation -----
 
 
@@ -467,6 +482,91 @@ class LLMFactory:
             logger.error(f"Error generating embedding: {e}", exc_info=True)
             raise
 
+    @staticmethod
+    async def embed_query(
+        query: str,
+        provider: Optional[str] = None,
+        model: Optional[str] = None,
+    ) -> List[float]:
+        """
+        Generate an embedding for a search query, reusing recent results.
+
+        Queries that differ only in surrounding or repeated whitespace share
+        a cache entry. The returned list is shared with the cache and must
+        not be modified.
+
+        Args:
+            query: The query text to embed
+            provider: The provider to use for embeddings (defaults to Google)
+            model: The embedding model to use (defaults to settings.EMBEDDING_MODEL)
+
+        Returns:
+            List of floats representing the embedding
+        """
+        embedding_model = model or settings.EMBEDDING_MODEL
+        key = (embedding_model, " ".join(query.split()))
+        now = time.monotonic()
+
+        cached = _query_embedding_cache.get(key)
+        if cached is not None:
+            expires_at, embedding = cached
+            if expires_at > now:
+                _query_embedding_cache.move_to_end(key)
+                logger.debug("Query embedding cache hit")
+                return embedding
+            del _query_embedding_cache[key]
+
+        embedding = await LLMFactory.embed_text(
+            text=key[1], provider=provider, model=embedding_model
+        )
+
+        _query_embedding_cache[key] = (
+            now + QUERY_EMBEDDING_CACHE_TTL_SECONDS,
+            embedding,
+        )
+        _query_embedding_cache.move_to_end(key)
+        while len(_query_embedding_cache) > QUERY_EMBEDDING_CACHE_SIZE:
+            _query_embedding_cache.popitem(last=False)
+
+        return embedding
+
+    @staticmethod
+    async def embed_texts(
+        texts: List[str],
+        model: Optional[str] = None,
+    ) -> List[List[float]]:
+        """
+        Generate embeddings for several texts with a single Google request.
+
+        Args:
+            texts: The texts to embed (at most 100 per call)
+            model: The embedding model to use (defaults to settings.EMBEDDING_MODEL)
+
+        Returns:
+            One embedding per input text, in the same order
+        """
+        try:
+            embedding_model = model or settings.EMBEDDING_MODEL
+            logger.info(
+                f"Generating {len(texts)} embeddings using model: {embedding_model}"
+            )
+
+            from google import genai
+
+            client = genai.Client(api_key=settings.GEMINI_API_KEY)
+
+            # The async client keeps the event loop free while the request is
+            # in flight, so several batches can be awaited concurrently
+            result = await client.aio.models.embed_content(
+                model=embedding_model, contents=texts
+            )
+
+            return [embedding.values for embedding in result.embeddings]
+
+        except Exception as e:
+            logger.error(f"Error generating embeddings: {e}", exc_info=True)
+            raise
+
 
 # Convenience function
 async def complete(
@@ -85,7 +85,7 @@ class ChromaVectorStore(VectorStore):
 
                 vector_id = f"{document_id}_chunk_{i}"
                 ids.append(vector_id)
-                embeddings.append([float(x) for x in embedding])
+                embeddings.append(embedding)
                 documents.append(str(chunk['content']))
                 metadatas.append(metadata)
 
@@ -144,6 +144,18 @@ class ChromaVectorStore(VectorStore):
             logger.error(f"Failed to delete document chunks from ChromaDB: {e}", exc_info=True)
             raise
 
+    async def delete_knowledge_base_chunks(self, knowledge_base_id: str) -> None:
+        try:
+            logger.info(f"Deleting ChromaDB collection for knowledge base {knowledge_base_id}")
+            # get_or_create first: deleting a collection that was never created raises
+            collection = self._get_collection(knowledge_base_id)
+            self.client.delete_collection(collection.name)
+            logger.info(f"Successfully deleted chunks for knowledge base {knowledge_base_id}")
+
+        except Exception as e:
+            logger.error(f"Failed to delete knowledge base chunks from ChromaDB: {e}", exc_info=True)
+            raise
+
     async def search_similar(
         self,
         query: str,
@@ -153,7 +165,7 @@ class ChromaVectorStore(VectorStore):
         metadata_filter: Dict[str, Any] = None
     ) -> List[Dict[str, Any]]:
         try:
-            query_vector = await self._get_embedding(query)
+            query_vector = await self._get_query_embedding(query)
             collection = self._get_collection(knowledge_base_id)
 
             where_filter = None
@@ -292,7 +304,7 @@ class ChromaVectorStore(VectorStore):
         similarity_threshold: float = 0.3
     ) -> List[Dict]:
         try:
-            embedding = await self._get_embedding(query)
+            embedding = await self._get_query_embedding(query)
             collection = self._get_collection(knowledge_base_id)
 
             where_filter = None
@@ -374,7 +386,7 @@ class ChromaVectorStore(VectorStore):
                 }
 
                 all_ids.append(id_)
-                all_embeddings.append([float(x) for x in embedding])
+                all_embeddings.append(embedding)
                 all_documents.append(text)
                 all_metadatas.append(chroma_metadata)
 
@@ -406,3 +418,16 @@ class ChromaVectorStore(VectorStore):
         except Exception as e:
             logger.error(f"Failed to get embedding: {e}", exc_info=True)
             raise
+
+    async def _get_query_embedding(self, query: str) -> List[float]:
+        try:
+            embedding = await LLMFactory.embed_query(
+                query=query,
+                model=settings.EMBEDDING_MODEL,
+            )
+            if len(embedding) != self.dimension:
+                raise ValueError(f"Expected embedding dimension {self.dimension}, got {len(embedding)}")
+            return embedding
+        except Exception as e:
+            logger.error(f"Failed to get query embedding: {e}", exc_info=True)
+            raise
@@ -2,10 +2,18 @@ import logging
 import re
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Any, Dict, List
+from typing import Any, Dict, List, NamedTuple, Tuple
 
 logger = logging.getLogger(__name__)
 
+# Blank line(s) separating paragraphs
+_PARAGRAPH_SPLIT_RE = re.compile(r"\n\s*\n")
+# Markdown header line including the newline before it: group 1 holds the #
+# run giving the header level, group 2 the rest of the line. Anchoring on a
+# literal newline instead of ^ with re.MULTILINE lets the engine skip ahead to
+# candidate positions instead of trying every character.
+_HEADER_RE = re.compile(r"\n(#+)([^\S\n].*)")
+
 
 class ChunkSize(str, Enum):
     """Enum for chunk sizes"""
@@ -15,13 +23,32 @@ class ChunkSize(str, Enum):
     LARGE = "large"
 
 
+# Target chunk size in characters for each ChunkSize
+_SINGLE_CHUNK_SIZES = {
+    ChunkSize.SMALL: 1000,
+    ChunkSize.MEDIUM: 2000,
+    ChunkSize.LARGE: 4000,
+}
+# MultiLevelChunker chunks every section once per target size
+_MULTI_LEVEL_CHUNK_SIZES = (128, 256, 512)
+
+
+class Section(NamedTuple):
+    """A document section found by MultiLevelChunker._extract_sections"""
+
+    header: str
+    text: str
+    # Headers of the enclosing sections, outermost first
+    path: Tuple[str, ...]
+
+
 class Chunker(ABC):
     """
     Abstract base class for chunkers that split documents into chunks.
     """
 
     @abstractmethod
-    async def chunk(
+    def chunk(
         self,
         text: str,
         metadata: Dict[str, Any],
@@ -30,6 +57,10 @@ class Chunker(ABC):
         """
         Split text into chunks with metadata.
 
+        Chunking is CPU-bound string work, so this is synchronous; async
+        callers should run it with asyncio.to_thread to keep the event loop
+        free.
+
         Args:
             text: The text to chunk
             metadata: Metadata about the document
@@ -47,7 +78,7 @@ class SingleChunker(Chunker):
     Simple chunker that splits text into chunks of roughly equal size.
     """
 
-    async def chunk(
+    def chunk(
         self,
         text: str,
         metadata: Dict[str, Any],
@@ -67,22 +98,25 @@ class SingleChunker(Chunker):
                 - metadata: Enhanced metadata for the chunk
         """
         try:
-            logger.info(f"Chunking text with SingleChunker, chunk_size={chunk_size}")
+            logger.info("Chunking text with SingleChunker, chunk_size=%s", chunk_size)
 
             # Determine chunk size in characters
-            size_map = {
-                ChunkSize.SMALL: 1000,
-                ChunkSize.MEDIUM: 2000,
-                ChunkSize.LARGE: 4000,
+            target_size = _SINGLE_CHUNK_SIZES.get(chunk_size, 2000)
+
+            # Metadata shared by every chunk; only the index varies
+            base_metadata = {
+                **metadata,
+                "chunk_size": chunk_size,
+                "nearest_header": "",
+                "section_path": (),
             }
-            target_size = size_map.get(chunk_size, 2000)
 
             # Split text into paragraphs
-            paragraphs = re.split(r"\n\s*\n", text)
+            paragraphs = _PARAGRAPH_SPLIT_RE.split(text)
 
-            # Create chunks
+            # Create chunks; paragraphs are buffered and joined once per chunk
             chunks = []
-            current_chunk = ""
+            current_chunk = []
             current_size = 0
             chunk_index = 0
 
@@ -94,47 +128,40 @@ class SingleChunker(Chunker):
                 # If adding this paragraph would exceed the target size, start a new chunk
                 if current_size + len(paragraph) > target_size and current_chunk:
                     # Create chunk
-                    chunk_metadata = {
-                        **metadata,
-                        "chunk_index": chunk_index,
-                        "chunk_size": chunk_size,
-                        "nearest_header": "",
-                        "section_path": [],
-                    }
+                    chunk_metadata = dict(base_metadata, chunk_index=chunk_index)
 
                     chunks.append(
-                        {"content": current_chunk.strip(), "metadata": chunk_metadata}
+                        {
+                            "content": "\n\n".join(current_chunk),
+                            "metadata": chunk_metadata,
+                        }
                     )
 
                     # Reset for next chunk
-                    current_chunk = ""
+                    current_chunk = []
                     current_size = 0
                     chunk_index += 1
 
                 # Add paragraph to current chunk
-                current_chunk += paragraph + "\n\n"
+                current_chunk.append(paragraph)
                 current_size += len(paragraph)
 
             # Add the last chunk if it's not empty
             if current_chunk:
-                chunk_metadata = {
-                    **metadata,
-                    "chunk_index": chunk_index,
-                    "chunk_size": chunk_size,
-                    "nearest_header": "",
-                    "section_path": [],
-                }
+                chunk_metadata = dict(base_metadata, chunk_index=chunk_index)
 
                 chunks.append(
-                    {"content": current_chunk.strip(), "metadata": chunk_metadata}
+                    {"content": "\n\n".join(current_chunk), "metadata": chunk_metadata}
                 )
 
-            logger.info(f"Created {len(chunks)} chunks with SingleChunker")
+            logger.info("Created %d chunks with SingleChunker", len(chunks))
 
             return chunks
 
         except Exception as e:
-            logger.error(f"Failed to chunk text with SingleChunker: {e}", exc_info=True)
+            logger.error(
+                "Failed to chunk text with SingleChunker: %s", e, exc_info=True
+            )
             raise
 
 
@@ -144,7 +171,7 @@ class MultiLevelChunker(Chunker):
     Preserves section hierarchy and headers in metadata.
     """
 
-    async def chunk(
+    def chunk(
         self,
         text: str,
         metadata: Dict[str, Any],
@@ -165,37 +192,31 @@ class MultiLevelChunker(Chunker):
         """
         try:
             logger.info(
-                f"Chunking text with MultiLevelChunker, chunk_size={chunk_size}"
+                "Chunking text with MultiLevelChunker, chunk_size=%s", chunk_size
             )
 
-            # Determine chunk size in characters
-            size_map = {
-                ChunkSize.SMALL: 128,
-                ChunkSize.MEDIUM: 256,
-                ChunkSize.LARGE: 512,
-            }
-
             # Extract headers and sections
             sections = self._extract_sections(text)
 
+            # Metadata shared by every chunk
+            base_metadata = {**metadata, "chunk_size": chunk_size}
+
             chunks = []
             chunk_index = 0
 
-            for target_size in size_map.values():
+            for target_size in _MULTI_LEVEL_CHUNK_SIZES:
                 for section in sections:
-                    section_text = section["text"]
-                    section_path = section["path"]
-                    section_header = section["header"]
+                    section_header, section_text, section_path = section
 
                     # Skip empty sections
                     if not section_text.strip():
                         continue
 
                     # Split section into paragraphs
-                    paragraphs = re.split(r"\n\s*\n", section_text)
+                    paragraphs = _PARAGRAPH_SPLIT_RE.split(section_text)
 
-                    # Create chunks from paragraphs
-                    current_chunk = ""
+                    # Create chunks from paragraphs, buffered and joined once
+                    current_chunk = []
                     current_size = 0
 
                     for paragraph in paragraphs:
@@ -209,43 +230,41 @@ class MultiLevelChunker(Chunker):
                             and current_chunk
                         ):
                             # Create chunk
-                            chunk_metadata = {
-                                **metadata,
-                                "chunk_index": chunk_index,
-                                "chunk_size": chunk_size,
-                                "nearest_header": section_header,
-                                "section_path": section_path,
-                            }
+                            chunk_metadata = dict(
+                                base_metadata,
+                                chunk_index=chunk_index,
+                                nearest_header=section_header,
+                                section_path=section_path,
+                            )
 
                             chunks.append(
                                 {
-                                    "content": current_chunk.strip(),
+                                    "content": "\n\n".join(current_chunk),
                                     "metadata": chunk_metadata,
                                 }
                             )
 
                             # Reset for next chunk
-                            current_chunk = ""
+                            current_chunk = []
                             current_size = 0
                             chunk_index += 1
 
                         # Add paragraph to current chunk
-                        current_chunk += paragraph + "\n\n"
+                        current_chunk.append(paragraph)
                         current_size += len(paragraph)
 
                     # Add the last chunk if it's not empty
                     if current_chunk:
-                        chunk_metadata = {
-                            **metadata,
-                            "chunk_index": chunk_index,
-                            "chunk_size": chunk_size,
-                            "nearest_header": section_header,
-                            "section_path": section_path,
-                        }
+                        chunk_metadata = dict(
+                            base_metadata,
+                            chunk_index=chunk_index,
+                            nearest_header=section_header,
+                            section_path=section_path,
+                        )
 
                         chunks.append(
                             {
-                                "content": current_chunk.strip(),
+                                "content": "\n\n".join(current_chunk),
                                 "metadata": chunk_metadata,
                             }
                         )
@@ -258,11 +277,11 @@ class MultiLevelChunker(Chunker):
 
         except Exception as e:
             logger.error(
-                f"Failed to chunk text with MultiLevelChunker: {e}", exc_info=True
+                "Failed to chunk text with MultiLevelChunker: %s", e, exc_info=True
             )
             raise
 
-    def _extract_sections(self, text: str) -> List[Dict[str, Any]]:
+    def _extract_sections(self, text: str) -> List[Section]:
         """
         Extract sections and headers from text.
 
@@ -270,47 +289,48 @@ class MultiLevelChunker(Chunker):
             text: The text to extract sections from
 
         Returns:
-            List of dictionaries containing:
-                - header: The section header
-                - text: The section text
-                - path: The section path (list of parent headers)
+            List of sections with their header, text and path (tuple of
+            parent headers, shared by every chunk of the section)
         """
-        # Split text into lines
-        lines = text.split("\n")
-
-        # Find headers (lines starting with #)
-        headers = []
-        for i, line in enumerate(lines):
-            if re.match(r"^#+\s", line):
-                level = len(re.match(r"^#+", line).group(0))
-                header_text = line.lstrip("#").strip()
-                headers.append({"level": level, "text": header_text, "line": i})
+        # Find headers (lines starting with #) in one pass over the text. The
+        # leading newline lets a header on the first line match as well.
+        padded = "\n" + text
+        headers = [
+            {
+                "level": len(match.group(1)),
+                "text": match.group(2).strip(),
+                "start": match.start(),
+                "end": match.end(),
+            }
+            for match in _HEADER_RE.finditer(padded)
+        ]
 
         # If no headers found, return the entire text as one section
         if not headers:
-            return [{"header": "", "text": text, "path": []}]
+            return [Section("", text, ())]
 
-        # Extract sections
+        # Extract sections. parents holds the (level, text) of the enclosing
+        # headers, innermost last.
         sections = []
+        parents = []
         for i, header in enumerate(headers):
-            # Determine section start and end
-            start_line = header["line"] + 1
-            end_line = len(lines)
+            # Section text runs from the line after the header up to the
+            # newline that starts the next header, or to the end of the text
+            start = header["end"] + 1
+            end = len(padded)
 
             if i < len(headers) - 1:
-                end_line = headers[i + 1]["line"]
+                end = headers[i + 1]["start"]
 
-            # Extract section text
-            section_text = "\n".join(lines[start_line:end_line])
+            section_text = padded[start:end]
 
-            # Determine section path
-            path = []
-            for prev_header in headers[:i]:
-                if prev_header["level"] < header["level"]:
-                    path.append(prev_header["text"])
+            # Determine section path: drop headers at this level or deeper,
+            # what remains are the parents of this header
+            while parents and parents[-1][0] >= header["level"]:
+                parents.pop()
+            path = tuple(parent for _, parent in parents)
+            parents.append((header["level"], header["text"]))
 
-            sections.append(
-                {"header": header["text"], "text": section_text, "path": path}
-            )
+            sections.append(Section(header["text"], section_text, path))
 
         return sections
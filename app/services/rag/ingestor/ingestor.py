@@ -19,7 +19,7 @@ from docling.document_converter import (
 from PIL import Image
 
 from app.core.prompts import get_prompt, register_prompt
-from app.db.storage import get_storage_db
+from app.db.storage import SessionLocal as StorageSessionLocal
 from app.repositories.storage_repository import StorageRepository
 from app.services.llm.factory import CompletionOptions, LLMFactory, Message, Role
 
@@ -244,11 +244,10 @@ class CSVIngestor(Ingestor):
             )
 
             # insert into storage database as new table
-            storage_session = get_storage_db().__next__()
-
-            await StorageRepository.insert_csv(
-                storage_session, table_name, create_table_query, headers, rows[1:]
-            )
+            with StorageSessionLocal() as storage_session:
+                await StorageRepository.insert_csv(
+                    storage_session, table_name, create_table_query, headers, rows[1:]
+                )
 
             logger.info(
                 f"Successfully ingested CSV with {len(rows) - 1 if rows else 0} rows and {len(headers)} columns"
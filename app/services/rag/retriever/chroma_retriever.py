@@ -65,7 +65,7 @@ class ChromaRetriever(Retriever):
 
                 vector_id = f"{document_id}_chunk_{i}"
                 ids.append(vector_id)
-                embeddings.append([float(x) for x in embedding])
+                embeddings.append(embedding)
                 documents.append(str(chunk['content']))
                 metadatas.append(metadata)
 
@@ -103,7 +103,7 @@ class ChromaRetriever(Retriever):
         metadata_filter: Optional[Dict[str, Any]] = None,
     ) -> List[Dict[str, Any]]:
         try:
-            query_vector = await self._get_embedding(query)
+            query_vector = await self._get_query_embedding(query)
             collection = self._get_collection()
 
             where_filter = None
@@ -220,3 +220,14 @@ class ChromaRetriever(Retriever):
         except Exception as e:
             logger.error(f"Failed to get embedding: {e}", exc_info=True)
             raise
+
+    async def _get_query_embedding(self, query: str) -> List[float]:
+        try:
+            embedding = await LLMFactory.embed_query(
+                query=query,
+                model=settings.EMBEDDING_MODEL,
+            )
+            return embedding
+        except Exception as e:
+            logger.error(f"Failed to get query embedding: {e}", exc_info=True)
+            raise
@@ -1,13 +1,29 @@
+import asyncio
 import logging
-import random
 from typing import Any, Dict, List, Optional
 
 from app.core.config import settings
 from app.services.llm.factory import LLMFactory
 from app.services.rag.retriever.retriever import Retriever
+from app.services.rag.vector_store import (
+    EMBEDDING_BATCH_SIZE,
+    EMBEDDING_CONCURRENCY,
+    UPSERT_CONCURRENCY,
+    chunk_to_vector,
+    get_embeddings_batch,
+    is_transient_error,
+    retry_transient,
+    sample_vector_ids,
+    upsert_batch,
+)
 
 logger = logging.getLogger(__name__)
 
+# Pinecone's limit on ids per delete request, and how many deletes may run
+# at once
+DELETE_BATCH_SIZE = 1000
+DELETE_CONCURRENCY = 4
+
 
 class PineconeRetriever(Retriever):
     """
@@ -25,11 +41,19 @@ class PineconeRetriever(Retriever):
         super().__init__(knowledge_base_id)
 
         # Initialize Pinecone (lazy import)
-        from pinecone import Pinecone
+        if settings.PINECONE_USE_GRPC:
+            # Protobuf over gRPC sends embeddings as binary floats instead of JSON
+            from pinecone.grpc import PineconeGRPC as Pinecone
+        else:
+            from pinecone import Pinecone
 
         self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
         self.index_name = settings.PINECONE_INDEX_NAME
-        self.index = self.pc.Index(self.index_name)
+        if settings.PINECONE_INDEX_HOST:
+            # A known host avoids a describe_index call per retriever
+            self.index = self.pc.Index(host=settings.PINECONE_INDEX_HOST)
+        else:
+            self.index = self.pc.Index(self.index_name)
 
         # Vector dimension for embeddings
         self.dimension = 3072  # Dimension for gemini-embedding-001
@@ -44,71 +68,43 @@ class PineconeRetriever(Retriever):
                 - metadata: Dict containing document_id, chunk_index, metadata, etc.
         """
         try:
-            logger.info(
-                f"Starting to process {len(chunks)} chunks for knowledge base {self.knowledge_base_id}"
-            )
+            embed_semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+            upsert_semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+
+            async def process_group(group: List[Dict[str, Any]]) -> None:
+                # Each group is embedded in one request and upserted as soon
+                # as its own embeddings arrive, so upserts overlap the
+                # embedding calls of later groups
+                async with embed_semaphore:
+                    embeddings = await get_embeddings_batch(
+                        [chunk["content"] for chunk in group], self.dimension
+                    )
 
-            # Generate embeddings for chunks
-            vectors = []
-            for i, chunk in enumerate(chunks):
-                # Get embedding
-                document_id = str(chunk["metadata"]["document_id"])
-                logger.info(
-                    f"Generating embedding for chunk {i+1}/{len(chunks)} (doc_id: {document_id}) using LLM Factory"
-                )
-                embedding = await self._get_embedding(chunk["content"])
-                logger.info(f"Generated embedding with dimension {len(embedding)}")
-
-                # Store content and metadata separately for Pinecone
-                metadata = {
-                    "document_id": document_id,
-                    "chunk_index": int(chunk["metadata"]["chunk_index"]),
-                    "chunk_size": str(chunk["metadata"]["chunk_size"]),
-                    "doc_title": str(chunk["metadata"]["document_title"]),
-                    "doc_type": str(chunk["metadata"]["document_type"]),
-                    "section": str(chunk["metadata"]["nearest_header"]),
-                    "path": ",".join(str(x) for x in chunk["metadata"]["section_path"]),
-                    "content": str(chunk["content"]),
-                }
+                vectors = [
+                    chunk_to_vector(chunk, embedding)
+                    for chunk, embedding in zip(group, embeddings)
+                ]
+
+                # Per-record detail only when debugging; formatting the
+                # metadata dicts is not free at thousands of chunks
+                if logger.isEnabledFor(logging.DEBUG):
+                    for vector_id, _, metadata in vectors:
+                        logger.debug(
+                            f"Created vector record {vector_id} with metadata {metadata}"
+                        )
 
-                # Create vector record with unique ID
-                vector_id = (
-                    f"{document_id}_{metadata['chunk_index']}_{metadata['chunk_size']}"
-                )
-                vectors.append(
-                    {
-                        "id": vector_id,
-                        "values": [float(x) for x in embedding],
-                        "metadata": metadata,
-                    }
-                )
-                logger.info(
-                    f"Created vector record for chunk {i+1} with id {vector_id}"
-                )
+                # Use knowledge_base_id as namespace
+                async with upsert_semaphore:
+                    await upsert_batch(self.index, vectors, self.knowledge_base_id)
 
-            # Upsert vectors in batches of 100
-            batch_size = 100
-            total_batches = (len(vectors) + batch_size - 1) // batch_size
-
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
-                logger.info(
-                    f"Upserting batch {batch_num}/{total_batches} ({len(batch)} vectors)"
-                )
-                try:
-                    # Use knowledge_base_id as namespace
-                    self.index.upsert(vectors=batch, namespace=self.knowledge_base_id)
-                    logger.info(f"Successfully upserted batch {batch_num}")
-                except Exception as batch_error:
-                    logger.error(f"Failed to upsert batch {batch_num}: {batch_error}")
-                    # Log the first vector in the failing batch for debugging
-                    if batch:
-                        logger.info(f"Sample vector from failing batch: {batch[0]}")
-                    raise
+            groups = [
+                chunks[i : i + EMBEDDING_BATCH_SIZE]
+                for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
+            ]
+            await asyncio.gather(*(process_group(group) for group in groups))
 
             logger.info(
-                f"Successfully added {len(chunks)} chunks to Pinecone for knowledge base {self.knowledge_base_id}"
+                f"Successfully added {len(chunks)} chunks in {len(groups)} batches to Pinecone for knowledge base {self.knowledge_base_id}"
             )
 
         except Exception as e:
@@ -127,65 +123,30 @@ class PineconeRetriever(Retriever):
                 f"Attempting to delete chunks for document {document_id} in knowledge base {self.knowledge_base_id}"
             )
 
-            # First, try to use metadata filtering (works on Standard and Enterprise tiers)
             try:
-                self.index.delete(
-                    filter={"document_id": {"$eq": str(document_id)}},
-                    namespace=self.knowledge_base_id,
+                # Chunk ids are "{document_id}_{chunk_index}_{chunk_size}", so the
+                # document's vectors can be listed by id prefix directly
+                deleted = await self._delete_by_id_prefix(
+                    f"{document_id}_", self.knowledge_base_id
                 )
                 logger.info(
-                    f"Successfully deleted chunks using metadata filter for document {document_id}"
+                    f"Deleted {deleted} vectors by ID for document {document_id}"
                 )
-                return
             except Exception as e:
-                # If metadata filtering fails (Serverless and Starter tiers), use vector IDs
-                if (
-                    "Serverless and Starter indexes do not support deleting with metadata filtering"
-                    in str(e)
-                ):
-                    logger.info(
-                        "Pinecone Serverless/Starter tier detected, switching to ID-based deletion"
-                    )
-
-                    # Query to get all vectors for this document
-                    # We need to use a dummy vector for the query
-                    dummy_vector = [0.0] * self.dimension
-
-                    # Query with a high top_k to get all vectors for this document
-                    results = self.index.query(
-                        vector=dummy_vector,
-                        top_k=10000,  # Set a high limit to get all vectors
-                        include_metadata=True,
-                        namespace=self.knowledge_base_id,
-                    )
-
-                    # Filter results to only include vectors for this document
-                    vector_ids = []
-                    for match in results.matches:
-                        if match.metadata and match.metadata.get("document_id") == str(
-                            document_id
-                        ):
-                            vector_ids.append(match.id)
-
-                    if vector_ids:
-                        logger.info(
-                            f"Found {len(vector_ids)} vectors to delete for document {document_id}"
-                        )
-                        # Delete vectors by ID
-                        self.index.delete(
-                            ids=vector_ids, namespace=self.knowledge_base_id
-                        )
-                        logger.info(
-                            f"Successfully deleted {len(vector_ids)} vectors by ID for document {document_id}"
-                        )
-                    else:
-                        logger.info(
-                            f"No vectors found for document {document_id} in knowledge base {self.knowledge_base_id}"
-                        )
-                else:
-                    # If it's a different error, re-raise it
+                if is_transient_error(e):
+                    # Retries are exhausted; a filter delete would be throttled
+                    # just the same
                     raise
 
+                # Listing ids is only supported on serverless indexes; pod-based
+                # indexes support deleting by metadata filter instead
+                logger.info(
+                    f"Listing vectors by ID prefix failed ({e}), deleting by metadata filter"
+                )
+                await self._delete_by_filter(
+                    {"document_id": {"$eq": str(document_id)}}, self.knowledge_base_id
+                )
+
             logger.info(
                 f"Successfully deleted chunks for document {document_id} in knowledge base {self.knowledge_base_id}"
             )
@@ -194,6 +155,57 @@ class PineconeRetriever(Retriever):
             logger.error(f"Failed to delete document chunks: {e}", exc_info=True)
             raise
 
+    @retry_transient
+    async def _delete_by_id_prefix(self, prefix: str, namespace: str) -> int:
+        """
+        Delete every vector whose id starts with prefix, retrying transient
+        errors. Deleting is idempotent, so a retry starts over from the listing.
+
+        Args:
+            prefix: Vector id prefix to match
+            namespace: Pinecone namespace to delete from
+
+        Returns:
+            Number of vectors deleted
+        """
+        # Collect every page first so deletes don't shift the pagination
+        vector_ids = await asyncio.to_thread(
+            lambda: [
+                vector_id
+                for page in self.index.list(prefix=prefix, namespace=namespace)
+                for vector_id in page
+            ]
+        )
+        batches = [
+            vector_ids[i : i + DELETE_BATCH_SIZE]
+            for i in range(0, len(vector_ids), DELETE_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def delete_batch(batch: List[str]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(
+                    self.index.delete, ids=batch, namespace=namespace
+                )
+
+        await asyncio.gather(*(delete_batch(batch) for batch in batches))
+        return len(vector_ids)
+
+    @retry_transient
+    async def _delete_by_filter(
+        self, metadata_filter: Dict[str, Any], namespace: str
+    ) -> None:
+        """
+        Delete every vector matching a metadata filter, retrying transient errors.
+
+        Args:
+            metadata_filter: Pinecone metadata filter
+            namespace: Pinecone namespace to delete from
+        """
+        await asyncio.to_thread(
+            self.index.delete, filter=metadata_filter, namespace=namespace
+        )
+
     async def search(
         self,
         query: str,
@@ -221,7 +233,7 @@ class PineconeRetriever(Retriever):
 
             # Get query embedding
             logger.info("Generating query embedding using LLM Factory")
-            query_vector = await self._get_embedding(query)
+            query_vector = await self._get_query_embedding(query)
             logger.info(f"Generated embedding with dimension {len(query_vector)}")
 
             # Prepare filter
@@ -234,6 +246,10 @@ class PineconeRetriever(Retriever):
                 # All metadata fields are already flattened in Pinecone storage
                 # Just add to filter, ensuring all values are strings
                 for key, value in metadata_filter.items():
+                    # Skip knowledge_base_id — the namespace already scopes the
+                    # query, and chunk metadata does not carry the field
+                    if key == "knowledge_base_id":
+                        continue
                     if isinstance(value, dict) and "$in" in value:
                         # Handle $in operator for multiple values
                         filter_dict[key] = value
@@ -260,12 +276,12 @@ class PineconeRetriever(Retriever):
             # Process matches
             chunks = []
             filtered_out = 0
-            for match in results.matches:
+            for position, match in enumerate(results.matches):
                 if match.score >= similarity_threshold:
                     try:
                         # Get metadata safely
                         metadata = match.metadata or {}
-                        logger.info(f"Metadata: {metadata}")
+                        logger.debug(f"Metadata: {metadata}")
 
                         # Build chunk with required fields
                         chunk = {
@@ -289,7 +305,7 @@ class PineconeRetriever(Retriever):
                                 ),
                             },
                         }
-                        logger.info(f"Chunk: {chunk}")
+                        logger.debug(f"Chunk: {chunk}")
 
                         # Only skip if absolutely necessary
                         if not chunk["content"]:
@@ -297,26 +313,28 @@ class PineconeRetriever(Retriever):
                             continue
 
                         chunks.append(chunk)
-                        logger.info(f"Included chunk with score {match.score:.3f}")
+                        logger.debug(f"Included chunk with score {match.score:.3f}")
 
                     except Exception as chunk_error:
                         logger.error(f"Error processing chunk: {chunk_error}")
                         logger.info(f"Problematic metadata: {match.metadata}")
                         continue
                 else:
-                    filtered_out += 1
-                    logger.info(
-                        f"Filtered out chunk with score {match.score:.3f} (below threshold)"
+                    # Matches come back best first, so every remaining match
+                    # is below the threshold too
+                    filtered_out = len(results.matches) - position
+                    logger.debug(
+                        f"Filtered out {filtered_out} chunks from score {match.score:.3f} (below threshold)"
                     )
+                    break
 
-            # Sort chunks by score
-            chunks.sort(key=lambda x: x["score"], reverse=True)
+            # Already in score order, as Pinecone returned them
             final_chunks = chunks[:top_k]
 
             logger.info(f"Returning {len(final_chunks)} total chunks")
             if final_chunks:
                 logger.info(
-                    f"Final score range: {min(c['score'] for c in final_chunks):.3f} - {max(c['score'] for c in final_chunks):.3f}"
+                    f"Final score range: {final_chunks[-1]['score']:.3f} - {final_chunks[0]['score']:.3f}"
                 )
 
                 # Log sample content from top chunk
@@ -358,40 +376,32 @@ class PineconeRetriever(Retriever):
                 f"Fetching random chunks from knowledge base {self.knowledge_base_id}"
             )
 
-            # Fetch a larger sample to select random chunks from
-            sample_size = min(limit * 5, 100)  # Get more than we need, but not too many
-
-            # Create a random vector to fetch diverse results
-            random_vector = [random.uniform(-1, 1) for _ in range(self.dimension)]
-
-            # Query with the random vector
-            results = self.index.query(
-                vector=random_vector,
-                top_k=sample_size,
-                include_metadata=True,
-                namespace=self.knowledge_base_id,
+            # Sample ids uniformly from the namespace, then fetch only those
+            # vectors instead of querying with a random vector
+            sampled_ids = await asyncio.to_thread(
+                sample_vector_ids,
+                self.index,
+                self.knowledge_base_id,
+                limit,
+                self.dimension,
             )
-
-            if not results.matches:
+            if not sampled_ids:
                 logger.warning(
                     f"No chunks found in knowledge base {self.knowledge_base_id}"
                 )
                 return []
 
-            # Shuffle the results to randomize further
-            matches = list(results.matches)
-            random.shuffle(matches)
-
-            # Take only the requested number of chunks
-            selected_matches = matches[:limit]
+            response = await asyncio.to_thread(
+                self.index.fetch, ids=sampled_ids, namespace=self.knowledge_base_id
+            )
 
-            # Process the selected matches
+            # Process the fetched vectors
             chunks = []
-            for match in selected_matches:
-                metadata = match.metadata or {}
+            for vector_id, vector in response.vectors.items():
+                metadata = vector.metadata or {}
 
                 chunk = {
-                    "id": match.id,
+                    "id": vector_id,
                     "document_id": str(metadata.get("document_id", "")),
                     "title": str(metadata.get("doc_title", "Untitled")),
                     "content": str(metadata.get("content", "")),
@@ -410,28 +420,21 @@ class PineconeRetriever(Retriever):
             logger.error(f"Failed to get random chunks: {e}", exc_info=True)
             return []
 
-    async def _get_embedding(self, text: str) -> List[float]:
+    async def _get_query_embedding(self, query: str) -> List[float]:
         """
-        Get embedding for text using the LLM Factory.
+        Get embedding for a search query, reusing a recent one for the same query.
 
         Args:
-            text: The text to embed
+            query: The query to embed
 
         Returns:
             List of floats representing the embedding
         """
         try:
-            logger.info(
-                f"Generating embedding using LLM Factory with model: {settings.EMBEDDING_MODEL}"
+            return await LLMFactory.embed_query(
+                query=query, model=settings.EMBEDDING_MODEL
             )
 
-            # Use the LLM Factory for text embeddings
-            embedding = await LLMFactory.embed_text(
-                text=text, model=settings.EMBEDDING_MODEL
-            )
-
-            return embedding
-
         except Exception as e:
-            logger.error(f"Failed to get embedding: {e}", exc_info=True)
+            logger.error(f"Failed to get query embedding: {e}", exc_info=True)
             raise
@@ -1,14 +1,249 @@
+import asyncio
+import itertools
+import json
 import logging
 import random
 import threading
 from abc import ABC, abstractmethod
-from typing import Any, Dict, List, Optional
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from tenacity import (
+    retry,
+    retry_if_exception,
+    stop_after_attempt,
+    wait_random_exponential,
+)
 
 from app.core.config import settings
 from app.services.llm.factory import LLMFactory
 
 logger = logging.getLogger(__name__)
 
+# Texts per embedding request (the Gemini batch limit) and how many of those
+# requests may be in flight at once
+EMBEDDING_BATCH_SIZE = 100
+EMBEDDING_CONCURRENCY = 4
+
+# Vectors per Pinecone upsert and how many upserts may run at once
+UPSERT_BATCH_SIZE = 100
+UPSERT_CONCURRENCY = 8
+
+# Pinecone's limit on ids per delete request, and how many deletes may run
+# at once
+DELETE_BATCH_SIZE = 1000
+DELETE_CONCURRENCY = 4
+
+# Id listing pages (up to 100 ids each) read when sampling random chunks, so
+# sampling a large namespace costs a bounded number of requests
+RANDOM_SAMPLE_MAX_PAGES = 10
+
+# HTTP statuses of Pinecone errors worth retrying: rate limiting and
+# transient server errors
+TRANSIENT_ERROR_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+# gRPC status codes worth retrying, for clients created with
+# PINECONE_USE_GRPC; gRPC errors carry a code() instead of an HTTP status
+TRANSIENT_GRPC_STATUS_CODES = frozenset(
+    {"UNAVAILABLE", "DEADLINE_EXCEEDED", "RESOURCE_EXHAUSTED"}
+)
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """Whether a Pinecone call failed with a rate limit or a server error"""
+    if getattr(error, "status", None) in TRANSIENT_ERROR_STATUSES:
+        return True
+
+    # code() returns a grpc.StatusCode; compare by name so the REST client
+    # does not need grpc installed
+    code = getattr(error, "code", None)
+    return (
+        callable(code) and getattr(code(), "name", None) in TRANSIENT_GRPC_STATUS_CODES
+    )
+
+
+# Retries an async Pinecone call on transient errors with jittered exponential
+# backoff; any other error, and the last transient one, is re-raised
+retry_transient = retry(
+    retry=retry_if_exception(is_transient_error),
+    wait=wait_random_exponential(multiplier=0.5, max=8),
+    stop=stop_after_attempt(3),
+    reraise=True,
+)
+
+
+def sample_vector_ids(index: Any, namespace: str, k: int, dimension: int) -> List[str]:
+    """
+    Pick up to k vector ids at random from a namespace. This makes blocking
+    Pinecone calls, so async callers should run it with asyncio.to_thread.
+
+    Reservoir-samples the first RANDOM_SAMPLE_MAX_PAGES pages of the id
+    listing. Listing ids is only supported on serverless indexes; on pod-based
+    indexes it falls back to k of the ids nearest a random vector.
+
+    Args:
+        index: Pinecone index
+        namespace: Namespace to sample from
+        k: Number of ids to pick
+        dimension: Vector dimension of the index, for the fallback query
+
+    Returns:
+        Up to k vector ids
+    """
+    try:
+        reservoir: List[str] = []
+        seen = 0
+        pages = itertools.islice(
+            index.list(namespace=namespace), RANDOM_SAMPLE_MAX_PAGES
+        )
+        for page in pages:
+            for vector_id in page:
+                seen += 1
+                if len(reservoir) < k:
+                    reservoir.append(vector_id)
+                else:
+                    j = random.randrange(seen)
+                    if j < k:
+                        reservoir[j] = vector_id
+        return reservoir
+    except Exception as e:
+        if is_transient_error(e):
+            raise
+        logger.info(f"Listing vector ids failed ({e}), sampling by random query")
+
+    random_vector = [random.uniform(-1, 1) for _ in range(dimension)]
+    results = index.query(
+        vector=random_vector,
+        top_k=min(k * 5, 100),
+        include_metadata=False,
+        namespace=namespace,
+    )
+    vector_ids = [match.id for match in results.matches]
+    random.shuffle(vector_ids)
+    return vector_ids[:k]
+
+
+async def get_embeddings_batch(texts: List[str], dimension: int) -> List[List[float]]:
+    """
+    Get embeddings for up to EMBEDDING_BATCH_SIZE texts in one request.
+
+    Args:
+        texts: The texts to embed
+        dimension: Vector dimension of the index the embeddings are for
+
+    Returns:
+        Embeddings as lists of floats, in the same order as texts
+    """
+    embeddings = await LLMFactory.embed_texts(
+        texts=texts, model=settings.EMBEDDING_MODEL
+    )
+
+    for embedding in embeddings:
+        if len(embedding) != dimension:
+            raise ValueError(
+                f"Expected embedding dimension {dimension}, got {len(embedding)}"
+            )
+
+    return embeddings
+
+
+async def upsert_batch(index: Any, batch: List[Any], namespace: str) -> None:
+    """
+    Upsert a single batch of vectors on a worker thread.
+
+    Args:
+        index: Pinecone index
+        batch: Vector records with id, values and metadata, as dicts or
+            (id, values, metadata) tuples
+        namespace: Pinecone namespace to write to
+    """
+    try:
+        await asyncio.to_thread(index.upsert, vectors=batch, namespace=namespace)
+    except Exception as batch_error:
+        logger.error(f"Failed to upsert batch of {len(batch)} vectors: {batch_error}")
+        # Log the first vector in the failing batch for debugging
+        logger.info(f"Sample vector from failing batch: {batch[0]}")
+        raise
+
+
+async def upsert_vectors(index: Any, vectors: List[Any], namespace: str) -> None:
+    """
+    Upsert vectors in batches, running up to UPSERT_CONCURRENCY batches at
+    once on worker threads so the blocking client calls overlap.
+
+    Args:
+        index: Pinecone index
+        vectors: Vector records with id, values and metadata
+        namespace: Pinecone namespace to write to
+    """
+    batches = [
+        vectors[i : i + UPSERT_BATCH_SIZE]
+        for i in range(0, len(vectors), UPSERT_BATCH_SIZE)
+    ]
+    semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
+
+    async def upsert_bounded(batch: List[Any]) -> None:
+        async with semaphore:
+            await upsert_batch(index, batch, namespace)
+
+    await asyncio.gather(*(upsert_bounded(batch) for batch in batches))
+    logger.info(
+        f"Upserted {len(vectors)} vectors in {len(batches)} batches to namespace {namespace}"
+    )
+
+
+@lru_cache(maxsize=256)
+def _compile_filter(metadata_filter_json: str) -> Optional[Dict[str, Any]]:
+    """Translate a search_chunks metadata filter, given as canonical JSON, into
+    a Pinecone filter. Results are shared between callers and must not be
+    modified."""
+    compiled = {}
+    for key, value in json.loads(metadata_filter_json).items():
+        if key in ("similarity_threshold", "knowledge_base_id"):
+            # Not metadata filters: the threshold is applied to scores and
+            # the namespace already scopes the query
+            continue
+
+        if isinstance(value, dict):
+            # Already in Pinecone filter format; document IDs must be strings
+            if key == "document_id" and "$in" in value:
+                value["$in"] = [str(doc_id) for doc_id in value["$in"]]
+            compiled[key] = value
+        else:
+            # Otherwise, create an equality filter
+            compiled[key] = {"$eq": str(value)}
+
+    return compiled or None
+
+
+def chunk_to_vector(
+    chunk: Dict[str, Any], embedding: List[float]
+) -> Tuple[str, List[float], Dict[str, Any]]:
+    """Build the Pinecone record for a chunk, storing its content in metadata.
+
+    Records are (id, values, metadata) tuples, which the client turns into
+    vectors directly; dict records are copied and key-checked first.
+    """
+    chunk_metadata = chunk["metadata"]
+    document_id = str(chunk_metadata["document_id"])
+    chunk_index = int(chunk_metadata["chunk_index"])
+    chunk_size = str(chunk_metadata["chunk_size"])
+    return (
+        f"{document_id}_{chunk_index}_{chunk_size}",
+        embedding,
+        {
+            "document_id": document_id,
+            "chunk_index": chunk_index,
+            "chunk_size": chunk_size,
+            "doc_title": str(chunk_metadata["document_title"]),
+            "doc_type": str(chunk_metadata["document_type"]),
+            "section": str(chunk_metadata["nearest_header"]),
+            "path": ",".join(map(str, chunk_metadata["section_path"])),
+            "content": str(chunk["content"]),
+        },
+    )
+
 
 class VectorStore(ABC):
     """Abstract base class for vector stores"""
@@ -35,6 +270,10 @@ class VectorStore(ABC):
     ) -> None:
         """Delete all chunks for a document from the vector store"""
 
+    @abstractmethod
+    async def delete_knowledge_base_chunks(self, knowledge_base_id: str) -> None:
+        """Delete all chunks of every document in a knowledge base"""
+
     @abstractmethod
     async def search_similar(
         self,
@@ -73,7 +312,12 @@ class PineconeVectorStore(VectorStore):
         Args:
             index_name: Name of the Pinecone index to use ('docbrain' or 'summary')
         """
-        from pinecone import Pinecone
+        if settings.PINECONE_USE_GRPC:
+            # Protobuf over gRPC sends embeddings as binary floats instead of JSON
+            from pinecone.grpc import PineconeGRPC as Pinecone
+        else:
+            from pinecone import Pinecone
+
         # Initialize Pinecone client
         self.pc = Pinecone(api_key=settings.PINECONE_API_KEY)
 
@@ -82,7 +326,13 @@ class PineconeVectorStore(VectorStore):
 
         # Get the index
         try:
-            self.index = self.pc.Index(self.index_name)
+            if (
+                settings.PINECONE_INDEX_HOST
+                and self.index_name == settings.PINECONE_INDEX_NAME
+            ):
+                self.index = self.pc.Index(host=settings.PINECONE_INDEX_HOST)
+            else:
+                self.index = self.pc.Index(self.index_name)
             logger.info(f"Initialized Pinecone index: {self.index_name}")
         except Exception as e:
             logger.error(f"Failed to initialize Pinecone index {self.index_name}: {e}")
@@ -91,7 +341,6 @@ class PineconeVectorStore(VectorStore):
         # Vector dimension from gemini-embedding-001
         self.dimension = 3072
 
-
         # Connection status
         self._connected = True
 
@@ -123,71 +372,42 @@ class PineconeVectorStore(VectorStore):
                 f"Starting to process {len(chunks)} chunks for knowledge base {knowledge_base_id} in index {self.index_name}"
             )
 
-            # Generate embeddings for chunks
-            vectors = []
-            for i, chunk in enumerate(chunks):
-                # Get embedding
-                document_id = str(chunk["metadata"]["document_id"])
-                logger.info(
-                    f"Generating embedding for chunk {i+1}/{len(chunks)} (doc_id: {document_id}) using LLM Factory"
-                )
-                embedding = await self._get_embedding(chunk["content"])
-                logger.info(f"Generated embedding with dimension {len(embedding)}")
-
-                # Store content and metadata separately for Pinecone
-                metadata = {
-                    "document_id": document_id,
-                    "chunk_index": int(chunk["metadata"]["chunk_index"]),
-                    "chunk_size": str(chunk["metadata"]["chunk_size"]),
-                    "doc_title": str(chunk["metadata"]["document_title"]),
-                    "doc_type": str(chunk["metadata"]["document_type"]),
-                    "section": str(chunk["metadata"]["nearest_header"]),
-                    "path": ",".join(str(x) for x in chunk["metadata"]["section_path"]),
-                    "content": str(chunk["content"]),
-                }
+            embed_semaphore = asyncio.Semaphore(EMBEDDING_CONCURRENCY)
+            upsert_semaphore = asyncio.Semaphore(UPSERT_CONCURRENCY)
 
-                # Log metadata structure for infoging
-                logger.info(f"Input chunk metadata structure: {chunk['metadata']}")
-                logger.info(f"Processed metadata for Pinecone: {metadata}")
+            async def process_group(group: List[Dict[str, Any]]) -> None:
+                # Each group is upserted as soon as its own embeddings arrive,
+                # so upserts overlap the embedding calls of later groups
+                async with embed_semaphore:
+                    embeddings = await get_embeddings_batch(
+                        [chunk["content"] for chunk in group], self.dimension
+                    )
 
-                # Create vector record with unique ID
-                vector_id = (
-                    f"{document_id}_{metadata['chunk_index']}_{metadata['chunk_size']}"
-                )
-                vectors.append(
-                    {
-                        "id": vector_id,
-                        "values": [float(x) for x in embedding],
-                        "metadata": metadata,
-                    }
-                )
-                logger.info(
-                    f"Created vector record for chunk {i+1} with id {vector_id}"
-                )
+                vectors = [
+                    chunk_to_vector(chunk, embedding)
+                    for chunk, embedding in zip(group, embeddings)
+                ]
 
-            # Upsert vectors in batches of 100
-            batch_size = 100
-            total_batches = (len(vectors) + batch_size - 1) // batch_size
+                # Per-record detail only when debugging; formatting the
+                # metadata dicts is not free at thousands of chunks
+                if logger.isEnabledFor(logging.DEBUG):
+                    for vector_id, _, metadata in vectors:
+                        logger.debug(
+                            f"Created vector record {vector_id} with metadata {metadata}"
+                        )
 
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
-                logger.info(
-                    f"Upserting batch {batch_num}/{total_batches} ({len(batch)} vectors)"
-                )
-                try:
-                    # Use knowledge_base_id as namespace
-                    self.index.upsert(vectors=batch, namespace=knowledge_base_id)
-                    logger.info(f"Successfully upserted batch {batch_num}")
-                except Exception as batch_error:
-                    logger.error(f"Failed to upsert batch {batch_num}: {batch_error}")
-                    # Log the first vector in the failing batch for infoging
-                    if batch:
-                        logger.info(f"Sample vector from failing batch: {batch[0]}")
-                    raise
+                # Use knowledge_base_id as namespace
+                async with upsert_semaphore:
+                    await upsert_batch(self.index, vectors, knowledge_base_id)
+
+            groups = [
+                chunks[i : i + EMBEDDING_BATCH_SIZE]
+                for i in range(0, len(chunks), EMBEDDING_BATCH_SIZE)
+            ]
+            await asyncio.gather(*(process_group(group) for group in groups))
 
             logger.info(
-                f"Successfully added {len(chunks)} chunks to Pinecone for knowledge base {knowledge_base_id}"
+                f"Successfully added {len(chunks)} chunks in {len(groups)} batches to Pinecone for knowledge base {knowledge_base_id}"
             )
 
         except Exception as e:
@@ -255,64 +475,30 @@ class PineconeVectorStore(VectorStore):
                 f"Attempting to delete chunks for document {document_id} in knowledge base {knowledge_base_id} in index {self.index_name}"
             )
 
-            # First, fetch all vector IDs for this document by querying with the document_id
             try:
-                # Try to use metadata filtering first (works on Standard and Enterprise tiers)
-                self.index.delete(
-                    filter={"document_id": {"$eq": str(document_id)}},
-                    namespace=knowledge_base_id,
+                # Chunk ids are "{document_id}_{chunk_index}_{chunk_size}", so the
+                # document's vectors can be listed by id prefix directly
+                deleted = await self._delete_by_id_prefix(
+                    f"{document_id}_", knowledge_base_id
                 )
                 logger.info(
-                    f"Successfully deleted chunks using metadata filter for document {document_id}"
+                    f"Deleted {deleted} vectors by ID for document {document_id}"
                 )
-                return
             except Exception as e:
-                # If metadata filtering fails (Serverless and Starter tiers), use vector IDs
-                if (
-                    "Serverless and Starter indexes do not support deleting with metadata filtering"
-                    in str(e)
-                ):
-                    logger.info(
-                        "Pinecone Serverless/Starter tier detected, switching to ID-based deletion"
-                    )
-
-                    # Query to get all vectors for this document
-                    # We need to use a dummy vector for the query
-                    dummy_vector = [0.0] * self.dimension
-
-                    # Query with a high top_k to get all vectors for this document
-                    results = self.index.query(
-                        vector=dummy_vector,
-                        top_k=10000,  # Set a high limit to get all vectors
-                        include_metadata=True,
-                        namespace=knowledge_base_id,
-                    )
-
-                    # Filter results to only include vectors for this document
-                    vector_ids = []
-                    for match in results.matches:
-                        if match.metadata and match.metadata.get("document_id") == str(
-                            document_id
-                        ):
-                            vector_ids.append(match.id)
-
-                    if vector_ids:
-                        logger.info(
-                            f"Found {len(vector_ids)} vectors to delete for document {document_id}"
-                        )
-                        # Delete vectors by ID
-                        self.index.delete(ids=vector_ids, namespace=knowledge_base_id)
-                        logger.info(
-                            f"Successfully deleted {len(vector_ids)} vectors by ID for document {document_id}"
-                        )
-                    else:
-                        logger.info(
-                            f"No vectors found for document {document_id} in knowledge base {knowledge_base_id}"
-                        )
-                else:
-                    # If it's a different error, re-raise it
+                if is_transient_error(e):
+                    # Retries are exhausted; a filter delete would be throttled
+                    # just the same
                     raise
 
+                # Listing ids is only supported on serverless indexes; pod-based
+                # indexes support deleting by metadata filter instead
+                logger.info(
+                    f"Listing vectors by ID prefix failed ({e}), deleting by metadata filter"
+                )
+                await self._delete_by_filter(
+                    {"document_id": {"$eq": str(document_id)}}, knowledge_base_id
+                )
+
             logger.info(
                 f"Successfully deleted chunks for document {document_id} in knowledge base {knowledge_base_id}"
             )
@@ -321,6 +507,86 @@ class PineconeVectorStore(VectorStore):
             logger.error(f"Failed to delete document chunks: {e}", exc_info=True)
             raise
 
+    async def delete_knowledge_base_chunks(self, knowledge_base_id: str) -> None:
+        """Delete every vector of a knowledge base from Pinecone in one request
+
+        Args:
+            knowledge_base_id: ID of the knowledge base (used as namespace)
+        """
+        try:
+            logger.info(
+                f"Deleting all vectors for knowledge base {knowledge_base_id} in index {self.index_name}"
+            )
+            await self._delete_namespace(knowledge_base_id)
+        except Exception as e:
+            # A knowledge base that never stored any chunks has no namespace
+            if getattr(e, "status", None) == 404:
+                logger.info(f"No vectors stored for knowledge base {knowledge_base_id}")
+                return
+            logger.error(f"Failed to delete knowledge base chunks: {e}", exc_info=True)
+            raise
+
+    @retry_transient
+    async def _delete_namespace(self, namespace: str) -> None:
+        """
+        Delete every vector in a namespace, retrying transient errors.
+
+        Args:
+            namespace: Pinecone namespace to clear
+        """
+        await asyncio.to_thread(self.index.delete, delete_all=True, namespace=namespace)
+
+    @retry_transient
+    async def _delete_by_id_prefix(self, prefix: str, namespace: str) -> int:
+        """
+        Delete every vector whose id starts with prefix, retrying transient
+        errors. Deleting is idempotent, so a retry starts over from the listing.
+
+        Args:
+            prefix: Vector id prefix to match
+            namespace: Pinecone namespace to delete from
+
+        Returns:
+            Number of vectors deleted
+        """
+        # Collect every page first so deletes don't shift the pagination
+        vector_ids = await asyncio.to_thread(
+            lambda: [
+                vector_id
+                for page in self.index.list(prefix=prefix, namespace=namespace)
+                for vector_id in page
+            ]
+        )
+        batches = [
+            vector_ids[i : i + DELETE_BATCH_SIZE]
+            for i in range(0, len(vector_ids), DELETE_BATCH_SIZE)
+        ]
+        semaphore = asyncio.Semaphore(DELETE_CONCURRENCY)
+
+        async def delete_batch(batch: List[str]) -> None:
+            async with semaphore:
+                await asyncio.to_thread(
+                    self.index.delete, ids=batch, namespace=namespace
+                )
+
+        await asyncio.gather(*(delete_batch(batch) for batch in batches))
+        return len(vector_ids)
+
+    @retry_transient
+    async def _delete_by_filter(
+        self, metadata_filter: Dict[str, Any], namespace: str
+    ) -> None:
+        """
+        Delete every vector matching a metadata filter, retrying transient errors.
+
+        Args:
+            metadata_filter: Pinecone metadata filter
+            namespace: Pinecone namespace to delete from
+        """
+        await asyncio.to_thread(
+            self.index.delete, filter=metadata_filter, namespace=namespace
+        )
+
     async def search_similar(
         self,
         query: str,
@@ -339,7 +605,7 @@ class PineconeVectorStore(VectorStore):
 
             # Get query embedding using LLM Factory
             logger.info("Generating query embedding using LLM Factory")
-            query_vector = await self._get_embedding(query)
+            query_vector = await self._get_query_embedding(query)
             logger.info(f"Generated embedding with dimension {len(query_vector)}")
 
             # Prepare filter (no need to include knowledge_base_id as it's now a namespace)
@@ -352,6 +618,10 @@ class PineconeVectorStore(VectorStore):
                 # All metadata fields are already flattened in Pinecone storage
                 # Just add to filter, ensuring all values are strings
                 for key, value in metadata_filter.items():
+                    # Skip knowledge_base_id — the namespace already scopes the
+                    # query, and chunk metadata does not carry the field
+                    if key == "knowledge_base_id":
+                        continue
                     if isinstance(value, (list, tuple)):
                         # Handle list values (like section_path) by joining with commas
                         filter_dict[key] = ",".join(str(x) for x in value)
@@ -377,7 +647,7 @@ class PineconeVectorStore(VectorStore):
             # Process matches
             chunks = []
             filtered_out = 0
-            for match in results.matches:
+            for position, match in enumerate(results.matches):
                 if match.score >= similarity_threshold:
                     try:
                         # Get metadata safely
@@ -440,26 +710,28 @@ class PineconeVectorStore(VectorStore):
                             continue
 
                         chunks.append(chunk)
-                        logger.info(f"Included chunk with score {match.score:.3f}")
+                        logger.debug(f"Included chunk with score {match.score:.3f}")
 
                     except Exception as chunk_error:
                         logger.error(f"Error processing chunk: {chunk_error}")
                         logger.info(f"Problematic metadata: {match.metadata}")
                         continue
                 else:
-                    filtered_out += 1
-                    logger.info(
-                        f"Filtered out chunk with score {match.score:.3f} (below threshold)"
+                    # Matches come back best first, so every remaining match
+                    # is below the threshold too
+                    filtered_out = len(results.matches) - position
+                    logger.debug(
+                        f"Filtered out {filtered_out} chunks from score {match.score:.3f} (below threshold)"
                     )
+                    break
 
-            # Sort chunks by score
-            chunks.sort(key=lambda x: x["score"], reverse=True)
+            # Already in score order, as Pinecone returned them
             final_chunks = chunks[:limit]
 
             logger.info(f"Returning {len(final_chunks)} total chunks")
             if final_chunks:
                 logger.info(
-                    f"Final score range: {min(c['score'] for c in final_chunks):.3f} - {max(c['score'] for c in final_chunks):.3f}"
+                    f"Final score range: {final_chunks[-1]['score']:.3f} - {final_chunks[0]['score']:.3f}"
                 )
 
                 # Log sample content from top chunk
@@ -517,13 +789,40 @@ class PineconeVectorStore(VectorStore):
                     f"Expected embedding dimension {self.dimension}, got {len(embedding)}"
                 )
 
-            logger.info(f"Generated embedding with dimension {len(embedding)}")
+            logger.debug(f"Generated embedding with dimension {len(embedding)}")
             return embedding
 
         except Exception as e:
             logger.error(f"Failed to get embedding: {e}", exc_info=True)
             raise
 
+    async def _get_query_embedding(self, query: str) -> List[float]:
+        """
+        Get embedding for a search query, served from the query cache when the
+        same query was embedded recently.
+
+        Args:
+            query: The query to embed
+
+        Returns:
+            Embedding as a list of floats
+        """
+        try:
+            embedding = await LLMFactory.embed_query(
+                query=query, model=settings.EMBEDDING_MODEL
+            )
+
+            if len(embedding) != self.dimension:
+                raise ValueError(
+                    f"Expected embedding dimension {self.dimension}, got {len(embedding)}"
+                )
+
+            return embedding
+
+        except Exception as e:
+            logger.error(f"Failed to get query embedding: {e}", exc_info=True)
+            raise
+
     async def get_random_chunks(
         self, knowledge_base_id: str, limit: int = 5
     ) -> List[Dict]:
@@ -542,56 +841,28 @@ class PineconeVectorStore(VectorStore):
                 f"Fetching random chunks from knowledge base {knowledge_base_id} in index {self.index_name}"
             )
 
-            # Fetch all document IDs in this knowledge base
-            # We need to use a dummy query to get all vectors in the namespace
-            dummy_vector = [0.0] * self.dimension
-
-            # Query with a high top_k to get a good sample
-            response = self.index.query(
-                vector=dummy_vector,
-                top_k=1000,  # Get a large sample to choose from
-                include_metadata=True,
-                namespace=knowledge_base_id,
+            # Sample ids uniformly from the namespace, then fetch only those
+            # vectors instead of pulling a large metadata-heavy query result
+            sampled_ids = await asyncio.to_thread(
+                sample_vector_ids,
+                self.index,
+                knowledge_base_id,
+                limit,
+                self.dimension,
             )
-
-            if not response.matches:
+            if not sampled_ids:
                 logger.info(f"No chunks found in knowledge base {knowledge_base_id}")
                 return []
 
-            # Get all unique document IDs
-            doc_ids = set()
-            for match in response.matches:
-                if match.metadata and "document_id" in match.metadata:
-                    doc_ids.add(match.metadata["document_id"])
-
-            logger.info(
-                f"Found {len(doc_ids)} unique documents in knowledge base {knowledge_base_id}"
+            response = await asyncio.to_thread(
+                self.index.fetch, ids=sampled_ids, namespace=knowledge_base_id
             )
 
-            if not doc_ids:
-                return []
-
-            # Select random document IDs (up to 5)
-            selected_doc_ids = random.sample(list(doc_ids), min(5, len(doc_ids)))
-            logger.info(f"Selected {len(selected_doc_ids)} random documents")
-
-            # For each selected document, get a random chunk
             chunks = []
-            for doc_id in selected_doc_ids:
-                # Get all chunks for this document
-                doc_chunks = [
-                    match
-                    for match in response.matches
-                    if match.metadata and match.metadata.get("document_id") == doc_id
-                ]
-
-                if doc_chunks:
-                    # Select a random chunk
-                    random_chunk = random.choice(doc_chunks)
-
-                    # Format the chunk
-                    metadata = random_chunk.metadata or {}
-                    chunk = {
+            for vector in response.vectors.values():
+                metadata = vector.metadata or {}
+                chunks.append(
+                    {
                         "document_id": str(metadata.get("document_id", "")),
                         "content": str(metadata.get("content", "")),
                         "chunk_index": int(metadata.get("chunk_index", 0)),
@@ -604,46 +875,10 @@ class PineconeVectorStore(VectorStore):
                             "section": str(metadata.get("section", "")),
                         },
                     }
-                    chunks.append(chunk)
-
-            # If we don't have enough chunks, get more random ones
-            if len(chunks) < limit and response.matches:
-                remaining = limit - len(chunks)
-                random_matches = random.sample(
-                    response.matches, min(remaining, len(response.matches))
                 )
 
-                for match in random_matches:
-                    # Skip if already included
-                    if any(
-                        c["document_id"] == match.metadata.get("document_id", "")
-                        and c["chunk_index"]
-                        == int(match.metadata.get("chunk_index", 0))
-                        for c in chunks
-                    ):
-                        continue
-
-                    metadata = match.metadata or {}
-                    chunk = {
-                        "document_id": str(metadata.get("document_id", "")),
-                        "content": str(metadata.get("content", "")),
-                        "chunk_index": int(metadata.get("chunk_index", 0)),
-                        "title": str(metadata.get("doc_title", "Untitled")),
-                        "metadata": {
-                            "document_id": str(metadata.get("document_id", "")),
-                            "chunk_index": int(metadata.get("chunk_index", 0)),
-                            "doc_title": str(metadata.get("doc_title", "")),
-                            "doc_type": str(metadata.get("doc_type", "")),
-                            "section": str(metadata.get("section", "")),
-                        },
-                    }
-                    chunks.append(chunk)
-
-                    if len(chunks) >= limit:
-                        break
-
             logger.info(f"Returning {len(chunks)} random chunks")
-            return chunks[:limit]
+            return chunks
 
         except Exception as e:
             logger.error(f"Error getting random chunks: {e}", exc_info=True)
@@ -675,41 +910,24 @@ class PineconeVectorStore(VectorStore):
             logger.info(
                 f"Generating embedding for query using LLM Factory: '{query[:50]}...' (truncated)"
             )
-            embedding = await self._get_embedding(query)
+            embedding = await self._get_query_embedding(query)
             logger.info(f"Generated embedding with dimension {len(embedding)}")
 
-            # Create filter (no need to include knowledge_base_id as it's now a namespace)
-            filter = {}
-
-            # Add additional metadata filters if provided
+            # Translate the metadata filter once per distinct filter; the
+            # canonical JSON form is the cache key
+            filter = None
             if metadata_filter:
                 logger.info(f"Applying metadata filter: {metadata_filter}")
-                for key, value in metadata_filter.items():
-                    if key == "similarity_threshold":
-                        # Skip this key as it's not a metadata filter
-                        continue
-
-                    if isinstance(value, dict):
-                        # If value is a dict, it's already in Pinecone filter format
-                        # Special handling for $in operator with document_id
-                        if key == "document_id" and "$in" in value:
-                            # Ensure all document IDs are strings
-                            value["$in"] = [str(doc_id) for doc_id in value["$in"]]
-                            logger.info(
-                                f"Formatted document_id $in filter with {len(value['$in'])} IDs"
-                            )
-
-                        filter[key] = value
-                    else:
-                        # Otherwise, create an equality filter
-                        filter[key] = {"$eq": str(value)}
+                filter = _compile_filter(
+                    json.dumps(metadata_filter, sort_keys=True, default=str)
+                )
 
             logger.info(f"Final Pinecone filter: {filter}")
 
             # Query Pinecone with namespace
             response = self.index.query(
                 vector=embedding,
-                filter=filter if filter else None,
+                filter=filter,
                 top_k=top_k * 2,  # Get more results than needed to allow for filtering
                 include_metadata=True,
                 namespace=knowledge_base_id,
@@ -722,7 +940,7 @@ class PineconeVectorStore(VectorStore):
             # Convert to list of dictionaries with content and metadata
             chunks = []
             filtered_out = 0
-            for match in response.matches:
+            for position, match in enumerate(response.matches):
                 if match.score >= similarity_threshold:
                     if match.metadata:
                         chunk = {
@@ -744,7 +962,9 @@ class PineconeVectorStore(VectorStore):
                         }
                         chunks.append(chunk)
                 else:
-                    filtered_out += 1
+                    # Matches come back best first, so the rest are below too
+                    filtered_out = len(response.matches) - position
+                    break
 
             logger.info(
                 f"Found {len(chunks)} chunks above similarity threshold {similarity_threshold} (filtered out {filtered_out})"
@@ -779,11 +999,10 @@ class PineconeVectorStore(VectorStore):
             vectors = []
             for i, (text, metadata, id) in enumerate(zip(texts, metadatas, ids)):
                 # Get embedding
-                logger.info(
+                logger.debug(
                     f"Generating embedding for question {i+1}/{len(texts)} (id: {id})"
                 )
                 embedding = await self._get_embedding(text)
-                logger.info(f"Generated embedding with dimension {len(embedding)}")
 
                 # Clean up metadata - only include question-specific fields
                 # No document-specific fields like chunk_index, doc_title, etc.
@@ -797,40 +1016,17 @@ class PineconeVectorStore(VectorStore):
                     "user_id": metadata.get("user_id", ""),
                 }
 
-                logger.info(
-                    f"Prepared metadata for question: {pinecone_metadata.keys()}"
-                )
-
                 # Create vector record with unique ID
                 vectors.append(
                     {
                         "id": id,
-                        "values": [float(x) for x in embedding],
+                        "values": embedding,
                         "metadata": pinecone_metadata,
                     }
                 )
 
-            # Upsert vectors in batches of 100
-            batch_size = 100
-            total_batches = (len(vectors) + batch_size - 1) // batch_size
-
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i : i + batch_size]
-                batch_num = (i // batch_size) + 1
-                logger.info(
-                    f"Upserting batch {batch_num}/{total_batches} ({len(batch)} vectors)"
-                )
-
-                try:
-                    # Use collection_name as namespace
-                    self.index.upsert(vectors=batch, namespace=collection_name)
-                    logger.info(f"Successfully upserted batch {batch_num}")
-                except Exception as batch_error:
-                    logger.error(f"Failed to upsert batch {batch_num}: {batch_error}")
-                    # Log the first vector in the failing batch for debugging
-                    if batch:
-                        logger.info(f"Sample vector from failing batch: {batch[0]}")
-                    raise
+            # Use collection_name as namespace
+            await upsert_vectors(self.index, vectors, collection_name)
 
             logger.info(
                 f"Successfully added {len(texts)} questions to Pinecone for collection {collection_name}"
@@ -887,6 +1083,7 @@ class VectorStoreFactory:
                 instance = PineconeVectorStore(index_name=index_name)
             elif store_type == "chroma":
                 from app.services.rag.chroma_vector_store import ChromaVectorStore
+
                 instance = ChromaVectorStore(index_name=index_name)
             else:
                 raise ValueError(f"Unsupported vector store type: {store_type}")
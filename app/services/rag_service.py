@@ -1,3 +1,4 @@
+import asyncio
 import logging
 from functools import lru_cache
 from typing import Any, Dict, List, Optional
@@ -106,8 +107,8 @@ class RAGService:
             # Create chunker
             chunker = ChunkerFactory.create_chunker_from_metadata(enhanced_metadata)
 
-            # Chunk document
-            chunks = await chunker.chunk(text, enhanced_metadata)
+            # Chunk document off the event loop; chunking is CPU-bound
+            chunks = await asyncio.to_thread(chunker.chunk, text, enhanced_metadata)
 
             # Use knowledge_base_id from metadata to create retriever
             kb_id = metadata.get("knowledge_base_id")
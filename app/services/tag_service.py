@@ -5,9 +5,9 @@ from functools import lru_cache
 from typing import Any, Dict, List, Optional
 
 from app.core.prompts import get_prompt, register_prompt
-from app.db.database import get_db
+from app.db.database import SessionLocal
 from app.db.models.knowledge_base import Document, DocumentType
-from app.db.storage import get_storage_db
+from app.db.storage import SessionLocal as StorageSessionLocal
 from app.repositories.storage_repository import StorageRepository
 from app.services.llm.factory import CompletionOptions, LLMFactory, Message, Role
 
@@ -186,8 +186,8 @@ class TagService:
             # First get all tables using SHOW TABLES
             logger.info("Fetching all tables from storage database")
             try:
-                db = get_storage_db().__next__()
-                tables_result = await StorageRepository.query(db, "SHOW TABLES")
+                with StorageSessionLocal() as db:
+                    tables_result = await StorageRepository.query(db, "SHOW TABLES")
                 table_names = [row[0] for row in tables_result] if tables_result else []
             except Exception as e:
                 logger.error(f"All table query methods failed: {e}")
@@ -210,8 +210,10 @@ class TagService:
                 try:
                     # Try DESCRIBE command (MySQL/MariaDB)
                     describe_query = f"DESCRIBE {table_name}"
-                    db = get_storage_db().__next__()
-                    describe_result = await StorageRepository.query(db, describe_query)
+                    with StorageSessionLocal() as db:
+                        describe_result = await StorageRepository.query(
+                            db, describe_query
+                        )
 
                     columns = []
                     for row in describe_result:
@@ -240,8 +242,8 @@ class TagService:
                 # Get sample data (first few rows) to help LLM understand the data
                 try:
                     sample_query = f"SELECT * FROM {table_name} LIMIT 3"
-                    db = get_storage_db().__next__()
-                    sample_result = await StorageRepository.query(db, sample_query)
+                    with StorageSessionLocal() as db:
+                        sample_result = await StorageRepository.query(db, sample_query)
 
                     # Convert sample data to list of dicts
                     sample_data = []
@@ -286,12 +288,12 @@ class TagService:
         """
         try:
 
-            db = get_db().__next__()
-            documents = (
-                db.query(Document)
-                .filter(Document.knowledge_base_id == knowledge_base_id)
-                .all()
-            )
+            with SessionLocal() as db:
+                documents = (
+                    db.query(Document)
+                    .filter(Document.knowledge_base_id == knowledge_base_id)
+                    .all()
+                )
 
             return documents
 
@@ -385,8 +387,8 @@ class TagService:
 
             # Execute the query using the storage repository
             # Use the instance method through self.storage_repository
-            db = get_storage_db().__next__()
-            result_proxy = await StorageRepository.query(db, sql_query)
+            with StorageSessionLocal() as db:
+                result_proxy = await StorageRepository.query(db, sql_query)
             results = []
 
             # Convert result to list of dictionaries
@@ -9,7 +9,7 @@ from sqlalchemy.orm import Session
 
 from app.core.config import settings
 from app.core.prompts import get_prompt, register_prompt
-from app.db.database import get_db
+from app.db.database import SessionLocal
 from app.db.models.message import MessageContentType
 from app.repositories.document_repository import DocumentRepository
 from app.repositories.message_repository import MessageRepository
@@ -147,7 +147,8 @@ def initiate_document_ingestion(self, document_id: str) -> None:
 
     # Run the async function using asyncio.run()
     try:
-        return asyncio.run(_ingest(get_db().__next__()))
+        with SessionLocal() as db:
+            return asyncio.run(_ingest(db))
     except Exception as e:
         logger.error(
             f"Failed to run async process for document {document_id}: {e}",
@@ -159,16 +160,14 @@ def initiate_document_ingestion(self, document_id: str) -> None:
 async def _generate_document_summary(content: bytes, title: str) -> str:
     """Generate a summary of the document content using the LLM factory"""
     try:
-        # Convert bytes to base64 string
-        content_str = base64.b64encode(content).decode("utf-8")
-
-        # Truncate content if it's too long
+        # Truncate content if it's too long. Every 3 bytes encode to 4 base64
+        # characters, so only the prefix that survives truncation is encoded
+        # instead of the whole document.
         max_content_length = 10000  # Adjust based on model limits
-        truncated_content = (
-            content_str[:max_content_length] + "..."
-            if len(content_str) > max_content_length
-            else content_str
-        )
+        max_raw_length = max_content_length // 4 * 3
+        truncated_content = base64.b64encode(content[:max_raw_length]).decode("ascii")
+        if len(content) > max_raw_length:
+            truncated_content += "..."
 
         # Get the prompt from the registry
         prompt = get_prompt(
@@ -292,7 +291,8 @@ def initiate_document_vector_deletion(self, document_id: str) -> None:
             raise
 
     try:
-        return asyncio.run(_delete_vectors(get_db().__next__()))
+        with SessionLocal() as db:
+            return asyncio.run(_delete_vectors(db))
     except Exception as e:
         logger.error(
             f"Failed to run async process for document vector deletion {document_id}: {e}",
@@ -475,7 +475,8 @@ def initiate_rag_retrieval(
             await MESSAGE_REPO.set_failed(assistant_message_id, str(e), db)
             raise
 
-    return asyncio.run(_retrieve(get_db().__next__()))
+    with SessionLocal() as db:
+        return asyncio.run(_retrieve(db))
 
 
 @shared_task(
@@ -572,10 +573,9 @@ def initiate_question_ingestion(self, question_id: str) -> None:
     asyncio.set_event_loop(loop)
 
     try:
-        # Get database session
-        db = next(get_db())
-        # Run the async function
-        loop.run_until_complete(_ingest(db))
+        # Run the async function with a session that is closed afterwards
+        with SessionLocal() as db:
+            loop.run_until_complete(_ingest(db))
     except Exception as e:
         logger.error(f"Error in question ingestion: {e}", exc_info=True)
         self.retry(exc=e)
@@ -641,9 +641,8 @@ def initiate_question_vector_deletion(
         asyncio.set_event_loop(loop)
 
     try:
-        for db in get_db():
+        with SessionLocal() as db:
             loop.run_until_complete(_delete_vectors(db))
-            break
     except Exception as e:
         logger.error(f"Error in question vector deletion: {e}", exc_info=True)
         self.retry(exc=e)
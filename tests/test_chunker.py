@@ -0,0 +1,116 @@
+"""Tests for the document chunkers."""
+
+from app.services.rag.chunker.chunker import (
+    ChunkSize,
+    MultiLevelChunker,
+    Section,
+    SingleChunker,
+)
+
+DOCUMENT = """# Guide
+
+Intro paragraph.
+
+## Install
+
+Run the installer.
+
+Then restart.
+
+### Linux
+
+Use the package manager.
+
+## Usage
+
+Open the app.
+#not-a-header
+"""
+
+
+class TestSingleChunker:
+    def test_groups_paragraphs_up_to_target_size(self):
+        paragraphs = ["a" * 600, "b" * 600, "c" * 600, "d" * 600]
+        chunks = SingleChunker().chunk(
+            "\n\n".join(paragraphs), {"document_id": "doc-1"}, ChunkSize.SMALL
+        )
+
+        assert [c["content"] for c in chunks] == [
+            paragraphs[0],
+            paragraphs[1],
+            paragraphs[2],
+            paragraphs[3],
+        ]
+        assert [c["metadata"]["chunk_index"] for c in chunks] == [0, 1, 2, 3]
+        assert chunks[0]["metadata"]["document_id"] == "doc-1"
+
+    def test_joins_small_paragraphs(self):
+        chunks = SingleChunker().chunk("one\n\n  \n\ntwo\n \nthree", {})
+
+        assert len(chunks) == 1
+        assert chunks[0]["content"] == "one\n\ntwo\n\nthree"
+        assert chunks[0]["metadata"]["section_path"] == ()
+
+
+class TestMultiLevelChunker:
+    def test_extract_sections_builds_header_paths(self):
+        sections = MultiLevelChunker()._extract_sections(DOCUMENT)
+
+        assert [(s.header, s.path) for s in sections] == [
+            ("Guide", ()),
+            ("Install", ("Guide",)),
+            ("Linux", ("Guide", "Install")),
+            ("Usage", ("Guide",)),
+        ]
+        assert sections[1].text == "\nRun the installer.\n\nThen restart.\n"
+        assert sections[3].text == "\nOpen the app.\n#not-a-header\n"
+
+    def test_extract_sections_path_skips_closed_sections(self):
+        text = "# A\n## B\n# C\n### D\n## E\n"
+        sections = MultiLevelChunker()._extract_sections(text)
+
+        assert [(s.header, s.path) for s in sections] == [
+            ("A", ()),
+            ("B", ("A",)),
+            ("C", ()),
+            ("D", ("C",)),
+            ("E", ("C",)),
+        ]
+
+    def test_extract_sections_without_headers(self):
+        sections = MultiLevelChunker()._extract_sections("plain\n\ntext")
+
+        assert sections == [Section("", "plain\n\ntext", ())]
+
+    def test_chunks_every_section_at_each_size(self):
+        chunks = MultiLevelChunker().chunk(DOCUMENT, {"document_id": "doc-1"})
+
+        # Each section fits in one chunk, so every size level yields 4 chunks
+        assert len(chunks) == 12
+        first = chunks[:4]
+        assert [c["metadata"]["chunk_index"] for c in first] == [0, 1, 2, 3]
+        assert [c["metadata"]["nearest_header"] for c in first] == [
+            "Guide",
+            "Install",
+            "Linux",
+            "Usage",
+        ]
+        assert first[1]["content"] == "Run the installer.\n\nThen restart."
+        assert first[2]["metadata"]["section_path"] == ("Guide", "Install")
+        assert first[0]["metadata"]["document_id"] == "doc-1"
+        assert first[0]["metadata"]["chunk_size"] == ChunkSize.MEDIUM
+
+    def test_splits_long_sections(self):
+        text = "# Title\n\n" + "\n\n".join(["x" * 100] * 4)
+        chunks = MultiLevelChunker().chunk(text, {})
+
+        # 128: one paragraph per chunk, 256: two, 512: all four
+        assert [len(c["content"]) for c in chunks] == [
+            100,
+            100,
+            100,
+            100,
+            202,
+            202,
+            406,
+        ]
@@ -142,3 +142,66 @@ class TestRetrieverFactory:
 
         RetrieverFactory.create_retriever("kb-789", retriever_type="unknown")
         _mock_retriever.assert_called_with("kb-789")
+
+
+# ---------------------------------------------------------------------------
+# LLMFactory.embed_query — embedding call mocked
+# ---------------------------------------------------------------------------
+class TestQueryEmbeddingCache:
+    @pytest.fixture(autouse=True)
+    def embed_text(self):
+        from unittest.mock import AsyncMock, patch
+
+        from app.services.llm import factory
+
+        factory._query_embedding_cache.clear()
+        with patch.object(
+            factory.LLMFactory,
+            "embed_text",
+            new=AsyncMock(side_effect=lambda text, **kwargs: [float(len(text))]),
+        ) as mock:
+            yield mock
+        factory._query_embedding_cache.clear()
+
+    async def test_repeated_query_is_embedded_once(self, embed_text):
+        from app.services.llm.factory import LLMFactory
+
+        first = await LLMFactory.embed_query("what is docbrain?", model="m")
+        second = await LLMFactory.embed_query("  what is   docbrain? ", model="m")
+
+        assert first == second == [17.0]
+        embed_text.assert_awaited_once_with(
+            text="what is docbrain?", provider=None, model="m"
+        )
+
+    async def test_keyed_by_model(self, embed_text):
+        from app.services.llm.factory import LLMFactory
+
+        await LLMFactory.embed_query("query", model="a")
+        await LLMFactory.embed_query("query", model="b")
+
+        assert embed_text.await_count == 2
+
+    async def test_evicts_least_recently_used(self, embed_text, monkeypatch):
+        from app.services.llm import factory
+
+        monkeypatch.setattr(factory, "QUERY_EMBEDDING_CACHE_SIZE", 2)
+        for query in ["a", "b", "a", "c", "a", "b"]:
+            await factory.LLMFactory.embed_query(query, model="m")
+
+        # "b" was evicted by "c" while "a" stayed recently used
+        assert [c.kwargs["text"] for c in embed_text.await_args_list] == [
+            "a",
+            "b",
+            "c",
+            "b",
+        ]
+
+    async def test_expired_entries_are_refreshed(self, embed_text, monkeypatch):
+        from app.services.llm import factory
+
+        monkeypatch.setattr(factory, "QUERY_EMBEDDING_CACHE_TTL_SECONDS", 0)
+        await factory.LLMFactory.embed_query("query", model="m")
+        await factory.LLMFactory.embed_query("query", model="m")
+
+        assert embed_text.await_count == 2
@@ -1,7 +1,10 @@
 """Tests for the health and root endpoints using a real TestClient."""
 
 import sys
-from unittest.mock import MagicMock
+from datetime import datetime
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
 
 # Mock heavy dependencies so we can import app.main without ML libraries.
 _MOCKED_MODULES = [
@@ -45,7 +48,14 @@ except ImportError:
 
 from fastapi.testclient import TestClient
 
+from app.api.deps import get_current_user  # noqa: E402
+from app.api.endpoints.conversations import get_conversation_service  # noqa: E402
+from app.api.endpoints.messages import get_message_service  # noqa: E402
+from app.core.config import settings  # noqa: E402
+from app.db.database import get_db  # noqa: E402
 from app.main import app  # noqa: E402 — must come after mocks
+from app.schemas.message import MessageResponse  # noqa: E402
+from app.services.user_service import UserService  # noqa: E402
 
 client = TestClient(app)
 
@@ -91,3 +101,91 @@ class TestAppRoutes:
     def test_knowledge_base_routes_exist(self):
         routes = [r.path for r in app.routes]
         assert any(r.startswith("/knowledge-bases") for r in routes)
+
+
+class TestMessageEndpoints:
+    def _message(self, message_id: str) -> MessageResponse:
+        now = datetime(2024, 1, 1)
+        return MessageResponse(
+            id=message_id,
+            content="answer",
+            content_type="TEXT",
+            kind="ASSISTANT",
+            user_id="user-1",
+            conversation_id="conv-1",
+            knowledge_base_id="kb-1",
+            sources=[{"score": 0.9, "content": "chunk", "document_id": "doc-1"}],
+            status="PROCESSED",
+            created_at=now,
+            updated_at=now,
+        )
+
+    @pytest.fixture
+    def message_service(self, regular_user):
+        service = MagicMock()
+        service.list_messages = AsyncMock(
+            return_value=[self._message("msg-1"), self._message("msg-2")]
+        )
+        service.get_message = AsyncMock(return_value=self._message("msg-1"))
+        app.dependency_overrides[get_current_user] = lambda: regular_user
+        app.dependency_overrides[get_message_service] = lambda: service
+        yield service
+        app.dependency_overrides.clear()
+
+    def test_list_messages_serializes_json(self, message_service):
+        response = client.get("/conversations/conv-1/messages")
+        assert response.status_code == 200
+        assert response.headers["content-type"] == "application/json"
+        data = response.json()
+        assert [m["id"] for m in data] == ["msg-1", "msg-2"]
+        assert data[0]["sources"] == [
+            {"score": 0.9, "content": "chunk", "document_id": "doc-1"}
+        ]
+
+    def test_get_message_serializes_json(self, message_service):
+        response = client.get("/conversations/conv-1/messages/msg-1")
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == "msg-1"
+        assert data["kind"] == "ASSISTANT"
+        assert data["created_at"] == "2024-01-01T00:00:00"
+
+
+class TestUserEndpoints:
+    def test_me_returns_user_with_permissions(self, regular_user, monkeypatch):
+        monkeypatch.setattr(
+            UserService, "get_user", AsyncMock(return_value=regular_user)
+        )
+        app.dependency_overrides[get_current_user] = lambda: regular_user
+        app.dependency_overrides[get_db] = lambda: MagicMock()
+        try:
+            response = client.get("/users/me")
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["id"] == regular_user.id
+        assert data["permissions"]
+        assert "hashed_password" not in data
+
+
+class TestUnhandledErrors:
+    def test_unexpected_error_returns_sanitized_500(self, regular_user):
+        service = MagicMock()
+        service.list_conversations = AsyncMock(
+            side_effect=RuntimeError("SELECT secret FROM internals")
+        )
+        app.dependency_overrides[get_current_user] = lambda: regular_user
+        app.dependency_overrides[get_conversation_service] = lambda: service
+        origin = settings.CORS_ORIGIN_LIST[0]
+        try:
+            response = TestClient(app, raise_server_exceptions=False).get(
+                "/conversations/", headers={"Origin": origin}
+            )
+        finally:
+            app.dependency_overrides.clear()
+
+        assert response.status_code == 500
+        assert response.json() == {"detail": "Internal server error"}
+        assert response.headers["access-control-allow-origin"] == origin
@@ -0,0 +1,127 @@
+"""Tests for PineconeRetriever ingestion with the Pinecone index and embeddings mocked."""
+
+import logging
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from app.services.rag import vector_store
+from app.services.rag.retriever import pinecone_retriever
+from app.services.rag.retriever.pinecone_retriever import PineconeRetriever
+
+DIMENSION = 3
+
+
+@pytest.fixture
+def retriever():
+    """A PineconeRetriever bypassing __init__, so no Pinecone client is needed"""
+    instance = PineconeRetriever.__new__(PineconeRetriever)
+    instance.knowledge_base_id = "kb-1"
+    instance.index = MagicMock()
+    instance.dimension = DIMENSION
+    return instance
+
+
+@pytest.fixture
+def embed_texts():
+    async def fake_embed_texts(texts, model=None):
+        return [[float(len(text)), 0.0, 1.0] for text in texts]
+
+    with patch.object(
+        vector_store.LLMFactory,
+        "embed_texts",
+        new=AsyncMock(side_effect=fake_embed_texts),
+    ) as mock:
+        yield mock
+
+
+def _chunk(document_id: str, index: int, content: str = "text") -> dict:
+    return {
+        "content": content,
+        "metadata": {
+            "document_id": document_id,
+            "chunk_index": index,
+            "chunk_size": len(content),
+            "document_title": "Doc",
+            "document_type": "pdf",
+            "nearest_header": "Intro",
+            "section_path": ["Intro", "Overview"],
+        },
+    }
+
+
+def _upserted_vectors(retriever) -> list:
+    return [
+        vector
+        for call in retriever.index.upsert.call_args_list
+        for vector in call.kwargs["vectors"]
+    ]
+
+
+class TestAddChunks:
+    async def test_embeds_in_batches(self, retriever, embed_texts, monkeypatch):
+        monkeypatch.setattr(pinecone_retriever, "EMBEDDING_BATCH_SIZE", 2)
+        chunks = [_chunk("doc-1", i, "x" * (i + 1)) for i in range(5)]
+
+        await retriever.add_chunks(chunks)
+
+        assert sorted(len(c.kwargs["texts"]) for c in embed_texts.await_args_list) == [
+            1,
+            2,
+            2,
+        ]
+        upserted = {
+            vector_id: values[0]
+            for vector_id, values, _ in _upserted_vectors(retriever)
+        }
+        # Embeddings stay aligned with their chunks across batches
+        assert upserted == {f"doc-1_{i}_{i + 1}": float(i + 1) for i in range(5)}
+
+    async def test_rejects_wrong_dimension(self, retriever, embed_texts):
+        retriever.dimension = 4
+        with pytest.raises(ValueError):
+            await retriever.add_chunks([_chunk("doc-1", 0)])
+        retriever.index.upsert.assert_not_called()
+
+    async def test_upserts_each_embedding_batch(
+        self, retriever, embed_texts, monkeypatch
+    ):
+        monkeypatch.setattr(pinecone_retriever, "EMBEDDING_BATCH_SIZE", 2)
+        chunks = [_chunk("doc-1", i) for i in range(5)]
+
+        await retriever.add_chunks(chunks)
+
+        calls = retriever.index.upsert.call_args_list
+        assert sorted(len(c.kwargs["vectors"]) for c in calls) == [1, 2, 2]
+        assert {c.kwargs["namespace"] for c in calls} == {"kb-1"}
+
+    async def test_upsert_failure_propagates(self, retriever, embed_texts):
+        retriever.index.upsert.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError):
+            await retriever.add_chunks([_chunk("doc-1", 0)])
+
+    async def test_upserts_flattened_tuple_records(self, retriever, embed_texts):
+        await retriever.add_chunks([_chunk("doc-1", 3, "hello")])
+
+        ((vector_id, _, metadata),) = _upserted_vectors(retriever)
+        assert vector_id == "doc-1_3_5"
+        assert metadata == {
+            "document_id": "doc-1",
+            "chunk_index": 3,
+            "chunk_size": "5",
+            "doc_title": "Doc",
+            "doc_type": "pdf",
+            "section": "Intro",
+            "path": "Intro,Overview",
+            "content": "hello",
+        }
+
+    async def test_logs_one_info_line_per_call(self, retriever, embed_texts, caplog):
+        chunks = [_chunk("doc-1", i) for i in range(5)]
+
+        with caplog.at_level(logging.INFO, logger=pinecone_retriever.__name__):
+            await retriever.add_chunks(chunks)
+
+        records = [r for r in caplog.records if r.name == pinecone_retriever.__name__]
+        assert [r.levelno for r in records] == [logging.INFO]
+        assert "5 chunks" in records[0].getMessage()
@@ -0,0 +1,453 @@
+"""Tests for repositories against an in-memory SQLite database."""
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.base_class import Base
+from app.db.models.conversation import Conversation
+from app.db.models.knowledge_base import (
+    Document,
+    DocumentStatus,
+    KnowledgeBase,
+    knowledge_base_sharing,
+)
+from app.db.models.message import Message, MessageKind, MessageStatus
+from app.db.models.question import AnswerType, Question, QuestionStatus
+from app.db.models.user import User, UserRole
+from app.repositories.conversation_repository import ConversationRepository
+from app.repositories.document_repository import DocumentRepository
+from app.repositories.knowledge_base_repository import KnowledgeBaseRepository
+from app.repositories.message_repository import MessageRepository
+from app.repositories.question_repository import QuestionRepository
+from app.repositories.user_repository import UserRepository
+from app.schemas import question as question_schemas
+from app.schemas.conversation import ConversationUpdate
+
+
+@pytest.fixture
+def db():
+    engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+    Base.metadata.create_all(engine)
+    session = sessionmaker(autocommit=False, autoflush=False, bind=engine)()
+    try:
+        yield session
+    finally:
+        session.close()
+        engine.dispose()
+
+
+@pytest.fixture
+def captured_statements(db):
+    """SQL statements run on the test database; clear it once setup is done"""
+    statements = []
+
+    def capture(conn, cursor, statement, *args):
+        statements.append(statement)
+
+    event.listen(db.get_bind(), "before_cursor_execute", capture)
+    yield statements
+    event.remove(db.get_bind(), "before_cursor_execute", capture)
+
+
+def _add_user(db, user_id: str = "user-1", email: str = "user@example.com") -> User:
+    user = User(
+        id=user_id,
+        email=email,
+        hashed_password="hashed",
+        full_name="Test User",
+        role=UserRole.USER.value,
+        is_active=True,
+    )
+    db.add(user)
+    db.commit()
+    return user
+
+
+def _add_knowledge_base(
+    db, kb_id: str = "kb-1", name: str = "KB", user_id: str = "user-1"
+) -> KnowledgeBase:
+    knowledge_base = KnowledgeBase(id=kb_id, name=name, description="", user_id=user_id)
+    db.add(knowledge_base)
+    db.commit()
+    return knowledge_base
+
+
+def _add_question(db, question_id: str = "q-1") -> Question:
+    _add_user(db)
+    _add_knowledge_base(db)
+    question = Question(
+        id=question_id,
+        question="What?",
+        answer="That.",
+        answer_type=AnswerType.DIRECT.value,
+        status=QuestionStatus.PENDING.value,
+        knowledge_base_id="kb-1",
+        user_id="user-1",
+    )
+    db.add(question)
+    db.commit()
+    return question
+
+
+def _add_message(db, message_id: str = "msg-1") -> Message:
+    _add_user(db)
+    _add_knowledge_base(db)
+    db.add(
+        Conversation(
+            id="conv-1", title="Chat", user_id="user-1", knowledge_base_id="kb-1"
+        )
+    )
+    message = Message(
+        id=message_id,
+        content="",
+        kind=MessageKind.ASSISTANT.value,
+        conversation_id="conv-1",
+        knowledge_base_id="kb-1",
+        user_id="user-1",
+        status=MessageStatus.PROCESSING.value,
+    )
+    db.add(message)
+    db.commit()
+    return message
+
+
+class TestUserRepository:
+    async def test_create(self, db):
+        user = User(
+            id="user-1",
+            email="user@example.com",
+            hashed_password="hashed",
+            full_name="Test User",
+            role=UserRole.ADMIN.value,
+        )
+        created = await UserRepository.create(user, db)
+        assert created.id == "user-1"
+        assert created.role == UserRole.ADMIN
+        assert created.model_dump()["email"] == "user@example.com"
+
+    async def test_get_by_id(self, db):
+        _add_user(db)
+        user = await UserRepository.get_by_id("user-1", db)
+        assert user.email == "user@example.com"
+
+    async def test_get_by_id_missing(self, db):
+        assert await UserRepository.get_by_id("missing", db) is None
+
+    async def test_get_by_id_returns_independent_copies(self, db):
+        user = _add_user(db)
+        first = await UserRepository.get_by_id("user-1", db)
+        first.full_name = "Changed by caller"
+        second = await UserRepository.get_by_id("user-1", db)
+        assert second is not first
+        assert second.full_name == "Test User"
+        assert second.hashed_password == "hashed"
+
+        user.full_name = "Renamed"
+        db.commit()
+        renamed = await UserRepository.get_by_id("user-1", db)
+        assert renamed is not first
+        assert renamed.full_name == "Renamed"
+
+    async def test_get_by_email(self, db):
+        _add_user(db)
+        user = await UserRepository.get_by_email("user@example.com", db)
+        assert user.id == "user-1"
+        assert user == await UserRepository.get_by_id("user-1", db)
+        assert await UserRepository.get_by_email("missing@example.com", db) is None
+
+    async def test_list_all(self, db):
+        _add_user(db)
+        _add_user(db, "user-2", "other@example.com")
+        users = await UserRepository.list_all(db)
+        assert {u.id for u in users} == {"user-1", "user-2"}
+
+    async def test_delete(self, db):
+        _add_user(db)
+        assert await UserRepository.delete("user-1", db) is True
+        assert await UserRepository.delete("user-1", db) is False
+
+
+class TestQuestionRepository:
+    async def test_create(self, db):
+        _add_user(db)
+        _add_knowledge_base(db)
+        question = Question(
+            id="q-1",
+            question="What?",
+            answer="That.",
+            answer_type=AnswerType.DIRECT.value,
+            status=QuestionStatus.PENDING.value,
+            knowledge_base_id="kb-1",
+            user_id="user-1",
+        )
+        created = await QuestionRepository.create(question, db)
+        assert created.status == QuestionStatus.PENDING
+        assert created.answer_type == AnswerType.DIRECT
+        assert created.knowledge_base_id == "kb-1"
+
+    async def test_status_transitions(self, db):
+        _add_question(db)
+        question = await QuestionRepository.set_ingesting("q-1", db)
+        assert question.status == QuestionStatus.INGESTING
+        question = await QuestionRepository.set_completed("q-1", db)
+        assert question.status == QuestionStatus.COMPLETED
+
+    async def test_get_by_id_coerces_enums_without_touching_the_row(self, db):
+        question = _add_question(db)
+        response = await QuestionRepository.get_by_id("q-1", db)
+        assert response.status is question_schemas.QuestionStatus.PENDING
+        assert response.answer_type is question_schemas.AnswerType.DIRECT
+        assert type(question.status) is str
+        assert not db.dirty
+
+    async def test_set_status_bulk(self, db):
+        _add_question(db)
+        db.add(
+            Question(
+                id="q-2",
+                question="Why?",
+                answer="Because.",
+                answer_type=AnswerType.DIRECT.value,
+                status=QuestionStatus.PENDING.value,
+                knowledge_base_id="kb-1",
+                user_id="user-1",
+            )
+        )
+        db.commit()
+
+        updated = await QuestionRepository.set_status_bulk(
+            ["q-1", "q-2", "missing"], QuestionStatus.COMPLETED, db
+        )
+        assert updated == 2
+        db.expire_all()
+        assert {q.status for q in db.query(Question)} == {"COMPLETED"}
+
+    async def test_set_status_bulk_empty(self, db):
+        assert (
+            await QuestionRepository.set_status_bulk([], QuestionStatus.FAILED, db) == 0
+        )
+
+    async def test_update(self, db):
+        _add_question(db)
+        question = await QuestionRepository.update(
+            "q-1",
+            {"question": "Where?", "status": "PENDING", "not_a_column": "x"},
+            db,
+        )
+        assert question.question == "Where?"
+        assert question.answer == "That."
+        assert question.updated_at is not None
+
+    async def test_update_missing_question(self, db):
+        assert await QuestionRepository.update("missing", {"answer": "x"}, db) is None
+
+    async def test_set_status_on_missing_question(self, db):
+        assert await QuestionRepository.set_failed("missing", db) is None
+
+
+class TestMessageRepository:
+    async def test_create_does_not_reselect(self, db, captured_statements):
+        _add_message(db)
+        captured_statements.clear()
+        message = Message(
+            id="msg-2",
+            content="hello",
+            kind=MessageKind.USER.value,
+            conversation_id="conv-1",
+            knowledge_base_id="kb-1",
+            user_id="user-1",
+            status=MessageStatus.RECEIVED.value,
+        )
+        created = await MessageRepository.create(message, db)
+        assert created.id == "msg-2"
+        assert created.created_at is not None
+        assert not any(
+            s.lstrip().upper().startswith("SELECT") for s in captured_statements
+        )
+
+    async def test_update_with_sources(self, db):
+        _add_message(db)
+        sources = [{"score": 0.9, "content": "chunk", "document_id": "doc-1"}]
+        message = await MessageRepository.update_with_sources(
+            "msg-1", "answer", sources, db
+        )
+        assert message.content == "answer"
+        assert message.status == MessageStatus.PROCESSED
+        assert message.sources[0]["document_id"] == "doc-1"
+
+    async def test_update_with_sources_missing(self, db):
+        assert (
+            await MessageRepository.update_with_sources("missing", "x", [], db) is None
+        )
+
+    async def test_list_by_conversation(self, db):
+        _add_message(db)
+        messages = await MessageRepository.list_by_conversation("conv-1", db)
+        assert [m.id for m in messages] == ["msg-1"]
+        assert messages[0].kind == MessageKind.ASSISTANT
+
+    async def test_message_metadata_is_returned_as_dict(self, db):
+        message = _add_message(db)
+        message.message_metadata = {"route": "rag", "scores": [0.9]}
+        db.commit()
+
+        (listed,) = await MessageRepository.list_by_conversation("conv-1", db)
+        assert listed.message_metadata == {"route": "rag", "scores": [0.9]}
+
+
+class TestConversationRepository:
+    async def test_update(self, db):
+        _add_message(db)
+        user = await UserRepository.get_by_id("user-1", db)
+        conversation = await ConversationRepository.update(
+            "conv-1", ConversationUpdate(title="Renamed"), user, db
+        )
+        assert conversation.title == "Renamed"
+
+    async def test_update_other_users_conversation(self, db):
+        _add_message(db)
+        other = _add_user(db, "user-2", "other@example.com")
+        assert (
+            await ConversationRepository.update(
+                "conv-1", ConversationUpdate(title="Renamed"), other, db
+            )
+            is None
+        )
+        assert db.get(Conversation, "conv-1").title == "Chat"
+
+    async def test_delete_removes_messages(self, db):
+        _add_message(db)
+        user = await UserRepository.get_by_id("user-1", db)
+        assert await ConversationRepository.delete("conv-1", user, db) is True
+        assert db.get(Conversation, "conv-1") is None
+        assert db.get(Message, "msg-1") is None
+
+    async def test_delete_other_users_conversation(self, db):
+        _add_message(db)
+        other = _add_user(db, "user-2", "other@example.com")
+        assert await ConversationRepository.delete("conv-1", other, db) is False
+        assert db.get(Conversation, "conv-1") is not None
+        assert db.get(Message, "msg-1") is not None
+
+
+def _new_document(doc_id: str) -> Document:
+    return Document(
+        id=doc_id,
+        title=f"{doc_id}.txt",
+        knowledge_base_id="kb-1",
+        content_type="text/plain",
+        content=b"hello",
+        size_bytes=5,
+        user_id="user-1",
+        status=DocumentStatus.PENDING,
+    )
+
+
+class TestDocumentRepository:
+    async def test_create_many_inserts_without_reselect(self, db, captured_statements):
+        _add_user(db)
+        _add_knowledge_base(db)
+        captured_statements.clear()
+
+        created = await DocumentRepository.create_many(
+            [_new_document("doc-1"), _new_document("doc-2")], db
+        )
+
+        assert [d.id for d in created] == ["doc-1", "doc-2"]
+        assert created[0].status == DocumentStatus.PENDING
+        assert created[0].created_at is not None
+        assert not any(
+            s.lstrip().upper().startswith("SELECT") for s in captured_statements
+        )
+        assert db.get(Document, "doc-2") is not None
+
+    async def test_count_by_knowledge_base(self, db):
+        _add_user(db)
+        _add_knowledge_base(db)
+        db.add_all([_new_document("doc-1"), _new_document("doc-2")])
+        db.commit()
+
+        assert await DocumentRepository.count_by_knowledge_base("kb-1", db) == 2
+        assert await DocumentRepository.count_by_knowledge_base("kb-2", db) == 0
+
+    async def test_list_by_knowledge_base_leaves_out_content(
+        self, db, captured_statements
+    ):
+        _add_user(db)
+        _add_knowledge_base(db)
+        db.add_all([_new_document("doc-1"), _new_document("doc-2")])
+        db.commit()
+        captured_statements.clear()
+
+        documents = await DocumentRepository.list_by_knowledge_base("kb-1", db)
+
+        assert sorted(d.id for d in documents) == ["doc-1", "doc-2"]
+        assert documents[0].content is None
+        assert documents[0].size_bytes == 5
+        assert documents[0].status == DocumentStatus.PENDING
+        assert "documents.content," not in captured_statements[0]
+
+    async def test_get_with_knowledge_base_in_one_query(self, db, captured_statements):
+        _add_user(db)
+        _add_knowledge_base(db)
+        db.add(_new_document("doc-1"))
+        db.commit()
+        captured_statements.clear()
+
+        document, kb = await DocumentRepository.get_with_knowledge_base("doc-1", db)
+
+        assert document.id == "doc-1"
+        assert document.content is None
+        assert kb.id == "kb-1"
+        assert kb.user_id == "user-1"
+        assert len(captured_statements) == 1
+
+    async def test_get_with_knowledge_base_missing(self, db):
+        assert await DocumentRepository.get_with_knowledge_base("missing", db) is None
+
+    async def test_update_writes_without_loading_content(self, db, captured_statements):
+        _add_user(db)
+        _add_knowledge_base(db)
+        db.add(_new_document("doc-1"))
+        db.commit()
+        captured_statements.clear()
+
+        document = await DocumentRepository.update(
+            "doc-1", {"title": "Renamed", "status": DocumentStatus.FAILED}, db
+        )
+
+        assert document.title == "Renamed"
+        assert document.status == DocumentStatus.FAILED
+        assert document.content is None
+        assert not any("documents.content," in s for s in captured_statements)
+
+    async def test_update_missing_document(self, db):
+        assert await DocumentRepository.update("missing", {"title": "x"}, db) is None
+
+
+class TestKnowledgeBaseRepository:
+    async def test_list_shared_with_user(self, db):
+        _add_user(db)
+        _add_user(db, "user-2", "other@example.com")
+        _add_knowledge_base(db)
+        _add_knowledge_base(db, "kb-2", "KB 2")
+        db.execute(
+            knowledge_base_sharing.insert().values(
+                knowledge_base_id="kb-1", user_id="user-2"
+            )
+        )
+        db.commit()
+
+        shared = await KnowledgeBaseRepository.list_shared_with_user("user-2", db)
+        assert [kb.id for kb in shared] == ["kb-1"]
+        # The user id is bound as a parameter, not spliced into the SQL
+        assert (
+            await KnowledgeBaseRepository.list_shared_with_user("x' OR '1'='1", db)
+            == []
+        )
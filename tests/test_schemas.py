@@ -1,9 +1,16 @@
 """Tests for Pydantic schemas validation."""
 
+from datetime import datetime
+from types import SimpleNamespace
+
 import pytest
 from pydantic import ValidationError
 
 from app.db.models.user import UserRole
+from app.schemas._adapters import list_adapter_for
+from app.schemas.document import DocumentResponse
+from app.schemas.knowledge_base import KnowledgeBaseResponse
+from app.schemas.message import MessageResponse
 from app.schemas.user import UserCreate, UserResponse, UserUpdate
 
 
@@ -67,3 +74,108 @@ class TestUserResponse:
         )
         assert resp.id == "user-123"
         assert resp.is_active is True
+
+    def test_hashed_password_excluded_from_dump(self):
+        resp = UserResponse(
+            id="user-123",
+            email="test@example.com",
+            full_name="Test User",
+            is_active=True,
+            hashed_password="hashed_secret",
+        )
+        assert resp.hashed_password == "hashed_secret"
+        assert "hashed_password" not in resp.model_dump()
+        assert "hashed_secret" not in resp.model_dump_json()
+        assert "hashed_secret" not in repr(resp)
+
+
+class TestKnowledgeBaseResponse:
+    def test_user_defaults_to_none_and_is_excluded(self):
+        kb = KnowledgeBaseResponse(
+            id="kb-1", user_id="user-123", name="KB", description="desc"
+        )
+        assert kb.user is None
+        assert "user" not in kb.model_dump()
+
+
+class TestListAdapter:
+    def test_adapter_is_cached_per_model(self):
+        assert list_adapter_for(UserResponse) is list_adapter_for(UserResponse)
+        assert list_adapter_for(UserResponse) is not list_adapter_for(UserUpdate)
+
+    def test_validates_objects_from_attributes(self):
+        users = list_adapter_for(UserResponse).validate_python(
+            [
+                SimpleNamespace(
+                    id=f"user-{i}",
+                    email=f"user{i}@example.com",
+                    full_name="Test User",
+                    role="admin",
+                    is_active=True,
+                    hashed_password="hashed_secret",
+                )
+                for i in range(2)
+            ]
+        )
+        assert [u.id for u in users] == ["user-0", "user-1"]
+        assert users[0].role == UserRole.ADMIN
+
+
+class TestDocumentResponse:
+    def test_content_kept_out_of_dump_and_repr(self):
+        now = datetime(2024, 1, 1)
+        content = b"%PDF-" + b"x" * 1024
+        doc = DocumentResponse.model_validate(
+            SimpleNamespace(
+                id="doc-1",
+                user_id="user-1",
+                title="Doc",
+                content_type="application/pdf",
+                knowledge_base_id="kb-1",
+                content=content,
+                size_bytes=len(content),
+                status="PENDING",
+                error_message=None,
+                processed_chunks=None,
+                summary=None,
+                created_at=now,
+                updated_at=now,
+            )
+        )
+        assert doc.content is content
+        assert "content" not in doc.model_dump()
+        assert "%PDF-" not in repr(doc)
+
+
+class TestMessageResponse:
+    def _message(self, **fields):
+        now = datetime(2024, 1, 1)
+        return MessageResponse(
+            id="msg-1",
+            content="answer",
+            content_type="TEXT",
+            kind="ASSISTANT",
+            user_id="user-1",
+            conversation_id="conv-1",
+            knowledge_base_id="kb-1",
+            status="PROCESSED",
+            created_at=now,
+            updated_at=now,
+            **fields,
+        )
+
+    def test_sources_keep_only_present_fields(self):
+        message = self._message(
+            sources=[
+                {"score": 0.9, "content": "chunk", "document_id": "doc-1"},
+                {"score": 0.8, "content": "q", "question_id": "q-1", "extra": 1},
+            ]
+        )
+        assert message.model_dump()["sources"] == [
+            {"score": 0.9, "content": "chunk", "document_id": "doc-1"},
+            {"score": 0.8, "content": "q", "question_id": "q-1"},
+        ]
+
+    def test_source_requires_score_and_content(self):
+        with pytest.raises(ValidationError):
+            self._message(sources=[{"content": "chunk"}])
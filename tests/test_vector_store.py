@@ -0,0 +1,408 @@
+"""Tests for PineconeVectorStore with the Pinecone index and embeddings mocked."""
+
+import enum
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from tenacity import wait_none
+
+from app.services.llm import factory
+from app.services.rag import vector_store
+from app.services.rag.vector_store import PineconeVectorStore
+
+DIMENSION = 3
+
+
+@pytest.fixture
+def store():
+    """A PineconeVectorStore bypassing __init__, so no Pinecone client is needed"""
+    instance = PineconeVectorStore.__new__(PineconeVectorStore)
+    instance.index = MagicMock()
+    instance.index_name = "docbrain"
+    instance.dimension = DIMENSION
+    instance._connected = False
+    return instance
+
+
+@pytest.fixture
+def embed_texts():
+    async def fake_embed_texts(texts, model=None):
+        return [[float(len(text)), 0.0, 1.0] for text in texts]
+
+    with patch.object(
+        vector_store.LLMFactory,
+        "embed_texts",
+        new=AsyncMock(side_effect=fake_embed_texts),
+    ) as mock:
+        yield mock
+
+
+def _chunk(document_id: str, index: int, content: str = "text") -> dict:
+    return {
+        "content": content,
+        "metadata": {
+            "document_id": document_id,
+            "chunk_index": index,
+            "chunk_size": len(content),
+            "document_title": "Doc",
+            "document_type": "pdf",
+            "nearest_header": "Intro",
+            "section_path": ["Intro", "Overview"],
+        },
+    }
+
+
+class TestAddChunks:
+    async def test_embeds_in_batches(self, store, embed_texts, monkeypatch):
+        monkeypatch.setattr(vector_store, "EMBEDDING_BATCH_SIZE", 2)
+        chunks = [_chunk("doc-1", i, "x" * (i + 1)) for i in range(5)]
+
+        await store.add_chunks(chunks, "kb-1")
+
+        assert [len(c.kwargs["texts"]) for c in embed_texts.await_args_list] == [
+            2,
+            2,
+            1,
+        ]
+        upserted = {
+            vector_id: values[0]
+            for call in store.index.upsert.call_args_list
+            for vector_id, values, _ in call.kwargs["vectors"]
+        }
+        # Embeddings stay aligned with their chunks across batches
+        assert upserted == {f"doc-1_{i}_{i + 1}": float(i + 1) for i in range(5)}
+
+    async def test_rejects_wrong_dimension(self, store, embed_texts):
+        store.dimension = 4
+        with pytest.raises(ValueError):
+            await store.add_chunks([_chunk("doc-1", 0)], "kb-1")
+        store.index.upsert.assert_not_called()
+
+    async def test_upserts_each_embedding_batch(self, store, embed_texts, monkeypatch):
+        monkeypatch.setattr(vector_store, "EMBEDDING_BATCH_SIZE", 2)
+        chunks = [_chunk("doc-1", i) for i in range(5)]
+
+        await store.add_chunks(chunks, "kb-1")
+
+        calls = store.index.upsert.call_args_list
+        assert sorted(len(c.kwargs["vectors"]) for c in calls) == [1, 2, 2]
+        assert {c.kwargs["namespace"] for c in calls} == {"kb-1"}
+
+    async def test_upsert_failure_propagates(self, store, embed_texts):
+        store.index.upsert.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError):
+            await store.add_chunks([_chunk("doc-1", 0)], "kb-1")
+
+    async def test_flattens_chunk_metadata(self, store, embed_texts):
+        await store.add_chunks([_chunk("doc-1", 3, "hello")], "kb-1")
+
+        ((vector_id, _, metadata),) = store.index.upsert.call_args.kwargs["vectors"]
+        assert vector_id == "doc-1_3_5"
+        assert metadata == {
+            "document_id": "doc-1",
+            "chunk_index": 3,
+            "chunk_size": "5",
+            "doc_title": "Doc",
+            "doc_type": "pdf",
+            "section": "Intro",
+            "path": "Intro,Overview",
+            "content": "hello",
+        }
+
+
+class TransientError(Exception):
+    """Stands in for a Pinecone API error carrying an HTTP status"""
+
+    def __init__(self, status: int):
+        super().__init__(f"HTTP {status}")
+        self.status = status
+
+
+class GrpcStatusCode(enum.Enum):
+    """Stands in for grpc.StatusCode"""
+
+    UNAVAILABLE = 14
+    INVALID_ARGUMENT = 3
+
+
+class GrpcError(Exception):
+    """Stands in for a gRPC error, which carries a code() instead of a status"""
+
+    def __init__(self, status_code: GrpcStatusCode):
+        super().__init__(status_code.name)
+        self.status_code = status_code
+
+    def code(self) -> GrpcStatusCode:
+        return self.status_code
+
+
+class TestIsTransientError:
+    def test_http_statuses(self):
+        assert vector_store.is_transient_error(TransientError(429))
+        assert not vector_store.is_transient_error(TransientError(400))
+
+    def test_grpc_status_codes(self):
+        assert vector_store.is_transient_error(GrpcError(GrpcStatusCode.UNAVAILABLE))
+        assert not vector_store.is_transient_error(
+            GrpcError(GrpcStatusCode.INVALID_ARGUMENT)
+        )
+
+    def test_other_errors(self):
+        assert not vector_store.is_transient_error(RuntimeError("boom"))
+
+
+class TestDeleteDocumentChunks:
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        for method in (
+            PineconeVectorStore._delete_by_id_prefix,
+            PineconeVectorStore._delete_by_filter,
+        ):
+            monkeypatch.setattr(method.retry, "wait", wait_none())
+
+    async def test_deletes_by_id_prefix(self, store, monkeypatch):
+        monkeypatch.setattr(vector_store, "DELETE_BATCH_SIZE", 2)
+        store.index.list.return_value = iter(
+            [["doc-1_0_5", "doc-1_1_5"], ["doc-1_2_5"]]
+        )
+
+        await store.delete_document_chunks("doc-1", "kb-1")
+
+        store.index.list.assert_called_once_with(prefix="doc-1_", namespace="kb-1")
+        assert sorted(c.kwargs["ids"] for c in store.index.delete.call_args_list) == [
+            ["doc-1_0_5", "doc-1_1_5"],
+            ["doc-1_2_5"],
+        ]
+        store.index.query.assert_not_called()
+
+    async def test_falls_back_to_metadata_filter(self, store):
+        store.index.list.side_effect = Exception("list is not supported")
+
+        await store.delete_document_chunks("doc-1", "kb-1")
+
+        store.index.delete.assert_called_once_with(
+            filter={"document_id": {"$eq": "doc-1"}}, namespace="kb-1"
+        )
+
+    async def test_retries_transient_errors(self, store):
+        store.index.list.side_effect = [TransientError(429), iter([["doc-1_0_5"]])]
+
+        await store.delete_document_chunks("doc-1", "kb-1")
+
+        assert store.index.list.call_count == 2
+        store.index.delete.assert_called_once_with(ids=["doc-1_0_5"], namespace="kb-1")
+
+    async def test_retries_transient_grpc_errors(self, store):
+        store.index.list.side_effect = [
+            GrpcError(GrpcStatusCode.UNAVAILABLE),
+            iter([["doc-1_0_5"]]),
+        ]
+
+        await store.delete_document_chunks("doc-1", "kb-1")
+
+        assert store.index.list.call_count == 2
+        store.index.delete.assert_called_once_with(ids=["doc-1_0_5"], namespace="kb-1")
+
+    async def test_does_not_fall_back_after_transient_errors(self, store):
+        store.index.list.side_effect = TransientError(503)
+
+        with pytest.raises(TransientError):
+            await store.delete_document_chunks("doc-1", "kb-1")
+
+        assert store.index.list.call_count == 3
+        store.index.delete.assert_not_called()
+
+    async def test_errors_propagate(self, store):
+        store.index.list.side_effect = Exception("list is not supported")
+        store.index.delete.side_effect = RuntimeError("boom")
+        with pytest.raises(RuntimeError):
+            await store.delete_document_chunks("doc-1", "kb-1")
+
+
+class TestDeleteKnowledgeBaseChunks:
+    @pytest.fixture(autouse=True)
+    def no_backoff(self, monkeypatch):
+        monkeypatch.setattr(
+            PineconeVectorStore._delete_namespace.retry, "wait", wait_none()
+        )
+
+    async def test_deletes_namespace_in_one_request(self, store):
+        await store.delete_knowledge_base_chunks("kb-1")
+
+        store.index.delete.assert_called_once_with(delete_all=True, namespace="kb-1")
+        store.index.list.assert_not_called()
+
+    async def test_missing_namespace_is_ignored(self, store):
+        store.index.delete.side_effect = TransientError(404)
+
+        await store.delete_knowledge_base_chunks("kb-1")
+
+        store.index.delete.assert_called_once()
+
+    async def test_retries_transient_errors(self, store):
+        store.index.delete.side_effect = [TransientError(503), None]
+
+        await store.delete_knowledge_base_chunks("kb-1")
+
+        assert store.index.delete.call_count == 2
+
+
+class TestGetRandomChunks:
+    async def test_samples_ids_and_fetches_only_those(self, store):
+        ids = [f"doc-1_{i}_5" for i in range(10)]
+        store.index.list.return_value = iter([ids[:4], ids[4:]])
+        store.index.fetch.side_effect = lambda ids, namespace: SimpleNamespace(
+            vectors={
+                vector_id: SimpleNamespace(
+                    metadata={
+                        "document_id": "doc-1",
+                        "chunk_index": int(vector_id.split("_")[1]),
+                        "content": f"chunk {vector_id}",
+                        "doc_title": "Doc",
+                    }
+                )
+                for vector_id in ids
+            }
+        )
+
+        chunks = await store.get_random_chunks("kb-1", limit=3)
+
+        (call,) = store.index.fetch.call_args_list
+        assert len(call.kwargs["ids"]) == 3
+        assert set(call.kwargs["ids"]) <= set(ids)
+        assert call.kwargs["namespace"] == "kb-1"
+        assert len(chunks) == 3
+        assert all(c["document_id"] == "doc-1" for c in chunks)
+        store.index.query.assert_not_called()
+
+    async def test_empty_namespace(self, store):
+        store.index.list.return_value = iter([])
+        assert await store.get_random_chunks("kb-1") == []
+        store.index.fetch.assert_not_called()
+
+    def test_sample_covers_all_ids_when_fewer_than_k(self):
+        index = MagicMock()
+        index.list.return_value = iter([["a", "b"]])
+        sampled = vector_store.sample_vector_ids(index, "kb-1", 5, DIMENSION)
+        assert sorted(sampled) == ["a", "b"]
+
+    def test_sample_reads_a_bounded_number_of_pages(self, monkeypatch):
+        monkeypatch.setattr(vector_store, "RANDOM_SAMPLE_MAX_PAGES", 2)
+        pages_read = []
+
+        def pages(namespace):
+            for i in range(100):
+                pages_read.append(i)
+                yield [f"doc-{i}_0_5"]
+
+        index = MagicMock()
+        index.list.side_effect = pages
+
+        sampled = vector_store.sample_vector_ids(index, "kb-1", 5, DIMENSION)
+
+        assert sorted(sampled) == ["doc-0_0_5", "doc-1_0_5"]
+        assert pages_read == [0, 1]
+
+    async def test_falls_back_to_query_on_pod_indexes(self, store):
+        store.index.list.side_effect = Exception("list is not supported")
+        store.index.query.return_value = SimpleNamespace(
+            matches=[SimpleNamespace(id=f"doc-1_{i}_5") for i in range(10)]
+        )
+        store.index.fetch.return_value = SimpleNamespace(
+            vectors={
+                "doc-1_0_5": SimpleNamespace(
+                    metadata={"document_id": "doc-1", "content": "chunk"}
+                )
+            }
+        )
+
+        chunks = await store.get_random_chunks("kb-1", limit=3)
+
+        query = store.index.query.call_args.kwargs
+        assert query["include_metadata"] is False
+        assert query["namespace"] == "kb-1"
+        assert len(query["vector"]) == DIMENSION
+        assert len(store.index.fetch.call_args.kwargs["ids"]) == 3
+        assert [c["document_id"] for c in chunks] == ["doc-1"]
+
+
+class TestSearch:
+    @pytest.fixture(autouse=True)
+    def embed_text(self):
+        factory._query_embedding_cache.clear()
+        with patch.object(
+            vector_store.LLMFactory,
+            "embed_text",
+            new=AsyncMock(return_value=[0.1] * DIMENSION),
+        ) as mock:
+            yield mock
+
+    async def test_search_similar_scopes_by_namespace_only(self, store):
+        store.index.query.return_value = SimpleNamespace(matches=[])
+
+        await store.search_similar(
+            "query", "kb-1", metadata_filter={"knowledge_base_id": "kb-1"}
+        )
+
+        kwargs = store.index.query.call_args.kwargs
+        assert kwargs["namespace"] == "kb-1"
+        assert kwargs["filter"] is None
+
+    async def test_search_chunks_keeps_other_filters(self, store):
+        store.index.query.return_value = SimpleNamespace(matches=[])
+
+        await store.search_chunks(
+            "query",
+            "kb-1",
+            metadata_filter={"knowledge_base_id": "kb-1", "doc_type": "pdf"},
+        )
+
+        kwargs = store.index.query.call_args.kwargs
+        assert kwargs["namespace"] == "kb-1"
+        assert kwargs["filter"] == {"doc_type": {"$eq": "pdf"}}
+
+    async def test_repeated_query_reuses_embedding(self, store, embed_text):
+        store.index.query.return_value = SimpleNamespace(matches=[])
+
+        await store.search_similar("query", "kb-1")
+        await store.search_chunks("query ", "kb-1")
+
+        embed_text.assert_awaited_once()
+
+    async def test_search_similar_stops_at_threshold(self, store):
+        store.index.query.return_value = SimpleNamespace(
+            matches=[
+                SimpleNamespace(
+                    id=f"doc-1_{i}_5",
+                    score=score,
+                    metadata={"document_id": "doc-1", "content": f"chunk {i}"},
+                )
+                for i, score in enumerate([0.9, 0.7, 0.5, 0.2, 0.1])
+            ]
+        )
+
+        chunks = await store.search_similar(
+            "query", "kb-1", limit=5, similarity_threshold=0.4
+        )
+
+        assert [c["score"] for c in chunks] == [0.9, 0.7, 0.5]
+        assert [c["content"] for c in chunks] == ["chunk 0", "chunk 1", "chunk 2"]
+
+    async def test_search_chunks_compiles_filter_without_mutating_it(self, store):
+        store.index.query.return_value = SimpleNamespace(matches=[])
+        metadata_filter = {"document_id": {"$in": [1, 2]}, "doc_type": "pdf"}
+
+        await store.search_chunks("query", "kb-1", metadata_filter=metadata_filter)
+        await store.search_chunks(
+            "query", "kb-1", metadata_filter=dict(reversed(metadata_filter.items()))
+        )
+
+        first, second = store.index.query.call_args_list
+        assert first.kwargs["filter"] == {
+            "document_id": {"$in": ["1", "2"]},
+            "doc_type": {"$eq": "pdf"},
+        }
+        # Equal filters share one compiled filter regardless of key order
+        assert second.kwargs["filter"] is first.kwargs["filter"]
+        assert metadata_filter["document_id"]["$in"] == [1, 2]